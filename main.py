@@ -1,10 +1,6 @@
 from pathlib import Path
 import argparse
-
-from modules.SLC_manager import S1SLCManager
-from modules.orbit_manager import OrbitManager
-from modules.DEM_manager import DEMManager
-from modules.isce_processor import ISCEProcessor
+import asyncio
 
 
 def main():
@@ -21,6 +17,12 @@ def main():
 
     args = parser.parse_args()
 
+    # Heavy imports (ISCE2, GDAL, rasterio, asf_search) are deferred so '--help' stays fast
+    from modules.SLC_manager import S1SLCManager
+    from modules.orbit_manager import OrbitManager
+    from modules.DEM_manager import DEMManager
+    from modules.isce_processor import ISCEProcessor
+
     roi = tuple(args.roi)
 
     work_dir = Path(args.work_dir).resolve()
@@ -50,19 +52,20 @@ def main():
     slc.set_master(master_id)
     print(f"Master set to: {master_id}")
 
-    print("=== Download SLC ===")
-    slc.download_selected()
-
-    print("=== Orbit fetch ===")
+    print("=== Download SLC, Orbit fetch & DEM prepare (concurrent) ===")
     orb = OrbitManager(orbit_dir=orbit_dir)
-    orb.fetch_orbits(slc_manager=slc, precise_only=True)
-
-    print("=== DEM prepare ===")
     dem = DEMManager(save_dir=dem_dir)
-    dem_path = dem.prepare_dem(
-        slc_manager=slc,
-        buffer_deg=0.2
-    )
+
+    async def fetch_inputs():
+        # Orbits and DEM only need scene metadata (names/footprints), so both
+        # overlap the SLC transfers. ASF and Copernicus are separate servers.
+        return await asyncio.gather(
+            slc.download_selected_async(),
+            orb.fetch_orbits_async(slc_manager=slc, precise_only=True),
+            asyncio.to_thread(dem.prepare_dem, slc_manager=slc, buffer_deg=0.2),
+        )
+
+    _, _, dem_path = asyncio.run(fetch_inputs())
     print(f"DEM ready: {dem_path}")
 
     print("=== ISCE processing ===")
@@ -1,15 +1,27 @@
 import os
+import math
+import functools
+import json
 import tempfile
+import threading
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import shapely.wkt
 from shapely.geometry import box, shape
 from shapely.ops import unary_union
+from shapely.strtree import STRtree
 import rasterio
+from rasterio.enums import Resampling
 from dem_stitcher.stitcher import stitch_dem
 from osgeo import gdal
 from modules.auth_base import EarthdataAuth
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None # Falls back to hashlib.sha256 for cache keys
+
 class DEMManager(EarthdataAuth):
     """
     Manages Digital Elevation Model (DEM) acquisition and preparation for ISCE processing.
@@ -23,10 +35,18 @@ class DEMManager(EarthdataAuth):
     Attributes:
         save_dir (Path): Directory where the final ISCE product (.wgs84) will be stored.
         temp_dir (Path): Directory for intermediate files (e.g., stitched GeoTIFFs).
+        tile_cache_dir (Path): Directory holding the per-tile (1°x1°) DEM cache.
         current_tif (Path): Path to the currently processed (stitched) GeoTIFF file.
-        dem_file (Path): Path to the final ISCE-compatible DEM file.
+        dem_file (Path): Path to the final ISCE-compatible DEM file ('dem.vrt' or 'dem.wgs84').
     """
 
+    _TERRAIN_LUT = None # 256x4 uint8 'terrain' colormap, built on first plot
+
+    # DEMs with a public Cloud-Optimized GeoTIFF distribution: dem_name -> (S3 bucket, tile prefix)
+    COG_SOURCES = {
+        'glo_30': ('copernicus-dem-30m', 'Copernicus_DSM_COG_10'),
+    }
+
     def __init__(self, save_dir="dem_data", temp_dir=None):
         """
         Initializes the DEMManager.
@@ -46,10 +66,23 @@ class DEMManager(EarthdataAuth):
         else:
             self.temp_dir = Path(temp_dir)
             self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+        self.tile_cache_dir = self.save_dir / "tiles"
+        self.tile_cache_dir.mkdir(parents=True, exist_ok=True)
             
         self.current_tif = None
         self.dem_file = None
 
+        # Scene name -> shapely footprint, reused across intersection calls
+        self._geom_cache = {}
+
+        # float32 buffer reused by plot_dem() previews
+        self._preview_buf = None
+
+        # (path, mtime_ns, size) -> bool, shared with worker threads
+        self._valid_cache = {}
+        self._valid_lock = threading.Lock()
+
     def get_status(self):
         """
         Returns the current status and configuration of the manager.
@@ -62,7 +95,7 @@ class DEMManager(EarthdataAuth):
         """
         return {
             "module_name": "DEMManager",
-            "is_ready": self.dem_file is not None and self.dem_file.exists(),
+            "is_ready": self.dem_file is not None and self._is_valid_isce_file(self.dem_file),
             "save_dir": str(self.save_dir.resolve()),
             "temp_dir": str(self.temp_dir.resolve()),
             "dem_path": str(self.dem_file.resolve()) if self.dem_file else None
@@ -71,9 +104,14 @@ class DEMManager(EarthdataAuth):
     # --------------------------------------------------------------------------
     # 1. Main Logic: Fetch & Export
     # --------------------------------------------------------------------------
-    def fetch_dem(self, slc_manager=None, roi_wkt=None, dem_name='glo_30', buffer_deg=0.1, overwrite=False):
+    def fetch_dem(self, slc_manager=None, roi_wkt=None, dem_name='glo_30', buffer_deg=0.1, overwrite=False,
+                  quantize=True, min_tile_cover=0.5):
         """
-        Calculates the target bounds and downloads the stitched DEM (GeoTIFF) to the temp directory.
+        Calculates the target bounds and assembles the DEM (VRT mosaic) in the temp directory.
+
+        Source tiles are cached per integer-degree cell under 'tile_cache_dir', so shifted
+        or overlapping ROIs only download the tiles they do not share with earlier requests.
+        Cells the bounds barely touch are fetched only for the overlapping part.
 
         Priority:
             1. If `slc_manager` is provided, calculates the intersection of the Master and all Slaves.
@@ -84,9 +122,15 @@ class DEMManager(EarthdataAuth):
             roi_wkt (str, optional): WKT string defining the Region of Interest.
             dem_name (str): The DEM dataset name ('glo_30', 'nasadem', etc.). Defaults to 'glo_30'.
             buffer_deg (float): Buffer to add around the bounds in degrees. Defaults to 0.1.
+            overwrite (bool): If True, re-downloads the cached tiles covering the bounds.
+            quantize (bool): If True (default), stores heights as int16 meters, halving disk and
+                             read bandwidth for ISCE. Use False for sub-meter DEMs.
+            min_tile_cover (float): Fraction of a 1°x1° cell the bounds must cover before the whole
+                             cell is fetched and cached. Defaults to 0.5. Use 0 to always cache
+                             full tiles, or a value above 1 to fetch only the requested bounds.
 
         Returns:
-            Path or None: Path to the downloaded intermediate GeoTIFF file. Returns None on failure.
+            Path or None: Path to the intermediate DEM mosaic (VRT). Returns None on failure.
         """
         # 1. Calculate Bounds
         bounds = None
@@ -103,40 +147,47 @@ class DEMManager(EarthdataAuth):
             print("[Error] Provide 'slc_manager' or 'roi_wkt'.")
             return None
 
-        # 2. Apply Buffer
+        # 2. Apply Buffer & snap outward to the GLO-30 pixel grid (1 arcsec)
+        # Keeps the cache key stable against floating-point drift in the intersection
         bounds = self._add_buffer(bounds, buffer_deg)
+        grid = 1 / 3600
+        bounds = tuple(
+            (math.floor(b / grid) if i < 2 else math.ceil(b / grid)) * grid
+            for i, b in enumerate(bounds)
+        )
         
         # 3. Generate Unique Hash for this specific request
         # Includes bounds, dem_name, and buffer to ensure uniqueness
-        hash_input = f"{bounds}_{dem_name}_{buffer_deg}"
-        request_hash = hashlib.sha256(hash_input.encode()).hexdigest()[:12] # Use first 12 chars
+        # (Non-cryptographic xxh3 is enough for a cache key; 'v2_' keeps old sha256 names apart)
+        hash_input = f"{bounds}_{dem_name}_{buffer_deg}_{'int16' if quantize else 'float32'}"
+        if xxhash is not None:
+            request_hash = xxhash.xxh3_64(hash_input).hexdigest()[:12]
+        else:
+            request_hash = hashlib.sha256(hash_input.encode()).hexdigest()[:12] # Use first 12 chars
         
-        tif_filename = f"dem_{dem_name}_{request_hash}.tif"
+        tif_filename = f"dem_v2_{dem_name}_{request_hash}.vrt"
         output_path = self.temp_dir / tif_filename
         
         print(f"   Target Bounds (SNWE): {bounds[1]:.4f}, {bounds[3]:.4f}, {bounds[0]:.4f}, {bounds[2]:.4f}")
         print(f"   Cache Hash: {request_hash} -> File: {tif_filename}")
 
-        # 4. Check for existing file (Caching)
-        if not overwrite and output_path.exists() and output_path.stat().st_size > 1024:
-            print(f"   [Info] Matching DEM cache found. Skipping download.")
-            self.current_tif = output_path
-            return self.current_tif
-
-        # 5. Stitch to GeoTIFF (Actual Download)
-        if self._stitch_geotiff(bounds, dem_name, output_path):
+        # 4. Fetch missing tiles & build the mosaic (cached tiles are reused)
+        if self._build_from_tile_cache(bounds, dem_name, output_path, overwrite=overwrite, quantize=quantize,
+                                       min_tile_cover=min_tile_cover):
             self.current_tif = output_path
             return self.current_tif
         
         return None
 
-    def export_to_isce(self, overwrite=False):
+    def export_to_isce(self, overwrite=False, format="vrt"):
         """
-        Converts the fetched intermediate GeoTIFF to the ISCE-compatible format (.wgs84).
+        Exposes the fetched intermediate DEM to ISCE.
 
         Args:
             overwrite (bool): If True, forces regeneration of the file even if it exists.
                               If False, skips conversion if a valid ISCE file is already found.
+            format (str): 'vrt' (default) writes 'dem.vrt' plus its ISCE XML header, with no
+                          pixel copy. 'isce' converts to the raw ISCE binary ('dem.wgs84').
 
         Returns:
             Path or None: Path to the final ISCE DEM file. Returns None on failure.
@@ -145,6 +196,20 @@ class DEMManager(EarthdataAuth):
             print("[Error] No fetched DEM found. Run 'fetch_dem()' first.")
             return None
 
+        if format == "vrt":
+            # Rebuilding the VRT is cheap, so it always tracks the current DEM
+            vrt_path = self.save_dir / "dem.vrt"
+            print(f"[DEMManager] Exporting ISCE-readable VRT: {vrt_path}")
+            if self._write_vrt_dem(self.current_tif, vrt_path):
+                self.dem_file = vrt_path
+                print("   ✅ Export complete.")
+                return self.dem_file
+            return None
+
+        if format != "isce":
+            print(f"[Error] Unknown format '{format}'. Use 'vrt' or 'isce'.")
+            return None
+
         isce_path = self.save_dir / "dem.wgs84"
         print(f"[DEMManager] Exporting to ISCE format: {isce_path}")
 
@@ -160,19 +225,22 @@ class DEMManager(EarthdataAuth):
             return self.dem_file
         return None
 
-    def prepare_dem(self, overwrite=False, **kwargs):
+    def prepare_dem(self, overwrite=False, format="vrt", quantize=True, **kwargs):
         """
         Automated wrapper: Executes fetch_dem() followed by export_to_isce().
 
         Args:
             overwrite (bool): Whether to overwrite the existing ISCE file.
+            format (str): Output format passed to export_to_isce() ('vrt' or 'isce').
+            quantize (bool): Store heights as int16 meters (default). Set False to keep float32,
+                             e.g. for sub-meter DEMs in volcanic deformation studies.
             **kwargs: Arguments passed to fetch_dem() (e.g., slc_manager, roi_wkt).
 
         Returns:
             Path or None: Path to the final DEM file.
         """
-        if self.fetch_dem(overwrite=overwrite, **kwargs):
-            return self.export_to_isce(overwrite=overwrite)
+        if self.fetch_dem(overwrite=overwrite, quantize=quantize, **kwargs):
+            return self.export_to_isce(overwrite=overwrite, format=format)
         return None
 
     def plot_dem(self, roi_wkt=None, max_pixels=800):
@@ -197,9 +265,7 @@ class DEMManager(EarthdataAuth):
             return None
 
         import numpy as np
-        import matplotlib.pyplot as plt
         import folium
-        from rasterio.enums import Resampling
 
         # Read GeoTIFF (With Downsampling)
         with rasterio.open(self.current_tif) as src:
@@ -208,35 +274,55 @@ class DEMManager(EarthdataAuth):
             
             # 1. Calculate Scale Factor
             scale = min(1.0, max_pixels / max(src.width, src.height))
+
+            # 2. Pick the coarsest overview that is still at least as detailed as the preview
+            factors = src.overviews(1)
+            usable = [i for i, f in enumerate(factors) if f <= 1.0 / scale]
+            overview_level = usable[-1] if scale < 1.0 and usable else None
+
+        # 3. Read from the overview (only the remaining factor is resampled)
+        with rasterio.open(self.current_tif, overview_level=overview_level) as src:
+            scale = min(1.0, max_pixels / max(src.width, src.height))
             
-            # 2. Conditional Read
             if scale < 1.0:
                 new_width = int(src.width * scale)
                 new_height = int(src.height * scale)
-                
-                # Resample while reading to save memory
-                data = src.read(
-                    1,
-                    out_shape=(new_height, new_width),
-                    resampling=Resampling.bilinear
-                )
             else:
-                data = src.read(1)
+                new_width, new_height = src.width, src.height
+
+            # Reuse the preview buffer across calls (resampled while reading to save memory)
+            if self._preview_buf is None or self._preview_buf.shape != (new_height, new_width):
+                self._preview_buf = np.empty((new_height, new_width), dtype=np.float32)
+            data = src.read(1, out=self._preview_buf, resampling=Resampling.bilinear)
 
+            # Mask nodata; NaN voids (float DEMs) never compare equal, so test them explicitly
             nodata = src.nodata
-            if nodata is not None:
-                data = np.ma.masked_equal(data, nodata)
+            mask = np.isnan(data)
+            if nodata is not None and not np.isnan(nodata):
+                mask |= data == nodata
+            data = np.ma.masked_array(data, mask=mask, copy=False)
             
-            # Normalize and Colorize
-            d_min, d_max = np.nanmin(data), np.nanmax(data)
+            # Normalize and Colorize (min/max from cached GDAL statistics when available)
+            try:
+                stats = src.statistics(1, approx=True, clear_cache=False)
+                d_min, d_max = stats.min, stats.max
+            except Exception:
+                # Old TIFFs without statistics: reduce over the valid pixels only
+                valid = data.compressed() if np.ma.isMaskedArray(data) else data.ravel()
+                d_min, d_max = valid.min(), valid.max()
+                if np.isnan(d_min) or np.isnan(d_max):
+                    d_min, d_max = np.nanmin(valid), np.nanmax(valid)
+
+            # Quantize to uint8 indices in one pass and gather RGBA from the LUT
             if d_max > d_min:
-                norm_data = (data - d_min) / (d_max - d_min)
+                idx = np.clip((np.ma.filled(data, d_min) - d_min) * (255.0 / (d_max - d_min)), 0, 255).astype(np.uint8)
             else:
-                norm_data = np.zeros_like(data, dtype=float)
-            
-            cmap = plt.get_cmap('terrain')
-            colored_data = cmap(norm_data)
-            img_array = (colored_data * 255).astype(np.uint8)
+                idx = np.zeros(data.shape, dtype=np.uint8)
+            img_array = self._terrain_lut()[idx]
+
+            # Nodata pixels stay fully transparent (alpha 0)
+            if mask.any():
+                img_array[mask] = 0
 
         # Create Map
         center_lat = (b.bottom + b.top) / 2
@@ -279,28 +365,307 @@ class DEMManager(EarthdataAuth):
     # --------------------------------------------------------------------------
     # 2. Internal Helpers
     # --------------------------------------------------------------------------
-    def _stitch_geotiff(self, bounds, dem_name, output_path):
+    @classmethod
+    def _terrain_lut(cls):
+        """Returns the 256-entry RGBA (uint8) lookup table of the 'terrain' colormap."""
+        if cls._TERRAIN_LUT is None:
+            import numpy as np
+            import matplotlib.pyplot as plt
+            cls._TERRAIN_LUT = (plt.get_cmap('terrain')(np.linspace(0, 1, 256)) * 255).astype(np.uint8)
+        return cls._TERRAIN_LUT
+
+    def _stitch_geotiff(self, bounds, dem_name, output_path, quantize=False):
         """
-        Downloads and stitches DEM tiles into a single GeoTIFF using 'dem_stitcher'.
+        Downloads and stitches DEM tiles into a single GeoTIFF.
+        Output is tiled + ZSTD with internal overviews (2x-32x) for fast previews.
+
+        DEMs distributed as Cloud-Optimized GeoTIFFs (see COG_SOURCES) are range-read
+        via '_stitch_geotiff_cog' when the bounds lie inside one source tile (always the
+        case for tile-cache cells and parts); 'dem_stitcher' is used as the fallback.
         
-        Crucial: Sets 'dst_ellipsoidal_height=True' to convert the vertical datum 
-        from Geoid (EGM96) to Ellipsoid (WGS84), which is required for ISCE.
+        Crucial: Converts the vertical datum from the DEM's geoid to Ellipsoid (WGS84),
+        which is required for ISCE. The correction is applied by '_apply_geoid' with a
+        windowed geoid interpolator cached per extent instead of inside 'stitch_dem'.
         """
         if output_path.exists() and output_path.stat().st_size > 1024:
             print(f"   [Info] Intermediate GeoTIFF exists: {output_path}")
             return True
+
+        if dem_name in self.COG_SOURCES and self._stitch_geotiff_cog(bounds, dem_name, output_path, quantize):
+            return True
+
         print(f"[DEMManager] Downloading & Stitching '{dem_name}' to {output_path}...")
         try:
             X, p = stitch_dem(
-                bounds, dem_name=dem_name, dst_ellipsoidal_height=True, dst_area_or_point='Area'
+                bounds, dem_name=dem_name, dst_ellipsoidal_height=False, dst_area_or_point='Area'
             )
-            with rasterio.open(output_path, 'w', **p) as ds:
-                ds.write(X, 1)
+            self._apply_geoid(X, p, dem_name)
+            self._write_dem_tif(X, p, output_path, quantize)
             return True
         except Exception as e:
             print(f"[Error] Stitching failed: {e}")
             return False
 
+    def _stitch_geotiff_cog(self, bounds, dem_name, output_path, quantize=False):
+        """
+        Range-reads only the requested bounds from a Cloud-Optimized GeoTIFF tile on S3.
+
+        The tile is opened through '/vsis3/' (anonymous access) and only the window
+        covering 'bounds' is read, so traffic scales with the bounds instead of the
+        full tile. Registration matches 'stitch_dem(..., dst_area_or_point='Area')':
+        the geoid is sampled on the native (pixel-is-point) grid, then the transform
+        is shifted by half a pixel.
+
+        Returns:
+            bool: True on success, False if the bounds span several tiles or the tile
+                  cannot be read (e.g., open ocean); the caller then uses dem_stitcher.
+        """
+        import numpy as np
+        from affine import Affine
+        from rasterio.windows import Window
+
+        minx, miny, maxx, maxy = bounds
+        lon, lat = math.floor(minx), math.floor(miny)
+        if maxx > lon + 1 or maxy > lat + 1:
+            return False
+
+        print(f"[DEMManager] Range-reading '{dem_name}' COG window to {output_path}...")
+        env = rasterio.Env(
+            AWS_NO_SIGN_REQUEST='YES', GDAL_HTTP_MULTIPLEX='YES', VSI_CACHE='TRUE',
+            GDAL_DISABLE_READDIR_ON_OPEN='EMPTY_DIR'
+        )
+        try:
+            with env, rasterio.open(self._cog_tile_path(dem_name, lon, lat)) as src:
+                native = src.transform
+                is_point = src.tags().get('AREA_OR_POINT', 'Area') == 'Point'
+                shift = Affine.translation(0.5, 0.5) if is_point else Affine.identity()
+
+                # Window in the output (Area) grid, rounded outward and clipped to the tile
+                col0, row0 = ~(native * shift) * (minx, maxy)
+                col1, row1 = ~(native * shift) * (maxx, miny)
+                c0, r0 = max(0, math.floor(col0 + 1e-6)), max(0, math.floor(row0 + 1e-6))
+                c1, r1 = min(src.width, math.ceil(col1 - 1e-6)), min(src.height, math.ceil(row1 - 1e-6))
+                if c1 <= c0 or r1 <= r0:
+                    return False
+                window = Window(c0, r0, c1 - c0, r1 - r0)
+
+                X = src.read(1, window=window, out_dtype='float32')
+                if src.nodata is not None:
+                    X[X == src.nodata] = np.nan
+                p = {
+                    'driver': 'GTiff', 'dtype': 'float32', 'count': 1, 'crs': src.crs, 'nodata': np.nan,
+                    'width': X.shape[1], 'height': X.shape[0], 'transform': src.window_transform(window),
+                }
+
+            self._apply_geoid(X, p, dem_name) # On the native grid, like dem_stitcher
+            p['transform'] = p['transform'] * shift
+            self._write_dem_tif(X, p, output_path, quantize)
+            return True
+        except Exception as e:
+            print(f"   [Info] COG read unavailable ({e}). Falling back to dem_stitcher.")
+            return False
+
+    @classmethod
+    def _cog_tile_path(cls, dem_name, lon, lat):
+        """Builds the '/vsis3/' path of a COG tile, e.g. '.../Copernicus_DSM_COG_10_N42_00_E129_00_DEM.tif'."""
+        bucket, prefix = cls.COG_SOURCES[dem_name]
+        ns = "N" if lat >= 0 else "S"
+        ew = "E" if lon >= 0 else "W"
+        name = f"{prefix}_{ns}{abs(lat):02d}_00_{ew}{abs(lon):03d}_00_DEM"
+        return f"/vsis3/{bucket}/{name}/{name}.tif"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _geoid_interpolator(geoid_name, extent):
+        """
+        Reads the geoid grid over 'extent' (a window, not the global grid) and returns
+        an interpolator. Extents are whole-degree cells (see '_apply_geoid'), so every
+        tile and part inside a cell reuses one read per process.
+
+        Args:
+            geoid_name (str): dem_stitcher geoid name ('egm_08', 'egm_96', 'geoid_18').
+            extent (tuple): (minx, miny, maxx, maxy) in integer degrees.
+
+        Returns:
+            RegularGridInterpolator: Maps (lat, lon) to geoid undulation in meters.
+        """
+        import numpy as np
+        from scipy.interpolate import RegularGridInterpolator
+        from dem_stitcher.geoid import get_geoid_path, read_geoid
+
+        print(f"[DEMManager] Reading geoid '{geoid_name}' over {extent}...")
+        # 2 geoid pixels of padding keep the DEM edge pixels inside the interpolation grid
+        geoid, profile = read_geoid(get_geoid_path(geoid_name), extent=list(extent), res_buffer=2)
+        geoid = np.asarray(geoid).squeeze().astype('float64')
+        t = profile['transform']
+        lons = t.c + t.a * (np.arange(geoid.shape[1]) + 0.5)
+        lats = t.f + t.e * (np.arange(geoid.shape[0]) + 0.5)
+
+        # Latitudes must be ascending for the interpolator
+        if lats[0] > lats[-1]:
+            lats, geoid = lats[::-1], geoid[::-1]
+        return RegularGridInterpolator((lats, lons), geoid, bounds_error=False, fill_value=None)
+
+    @classmethod
+    def _apply_geoid(cls, X, p, dem_name, chunk_rows=256):
+        """
+        Converts geoid (orthometric) heights to ellipsoidal heights in place.
+
+        The geoid is the one the DEM heights are referenced to, taken from dem_stitcher's
+        DEM -> geoid mapping (GLO-30/90: EGM2008, SRTM/NASADEM: EGM96, 3DEP: GEOID18).
+        The geoid window is the DEM extent snapped outward to whole degrees, which keeps
+        the interpolator cache key identical for all tiles of a cell.
+        Rows are processed in chunks to bound the size of the coordinate grids.
+        """
+        import numpy as np
+        from dem_stitcher.geoid import DEM2GEOID
+
+        t = p['transform']
+        lons = t.c + t.a * (np.arange(X.shape[1]) + 0.5)
+        lats = t.f + t.e * (np.arange(X.shape[0]) + 0.5)
+        eps = 1e-6 # Edge pixel centers on an integer degree stay in their cell
+        extent = (
+            math.floor(min(lons[0], lons[-1]) + eps), math.floor(min(lats[0], lats[-1]) + eps),
+            math.ceil(max(lons[0], lons[-1]) - eps), math.ceil(max(lats[0], lats[-1]) - eps)
+        )
+        interp = cls._geoid_interpolator(DEM2GEOID[dem_name], extent)
+
+        for r0 in range(0, X.shape[0], chunk_rows):
+            r1 = min(r0 + chunk_rows, X.shape[0])
+            lat_grid, lon_grid = np.meshgrid(lats[r0:r1], lons, indexing='ij')
+            X[r0:r1] += interp((lat_grid, lon_grid)).astype(X.dtype)
+
+    @staticmethod
+    def _write_dem_tif(X, p, output_path, quantize=False):
+        """
+        Writes a stitched DEM array as a tiled, ZSTD-compressed GeoTIFF with overviews.
+        Data is written block by block to avoid a second full-size buffer during the write.
+
+        With 'quantize', heights are rounded to int16 meters (nodata -32768) per block;
+        1 m vertical precision is well below ISCE's topographic sensitivity.
+        """
+        import numpy as np
+
+        if quantize:
+            p.update(dtype='int16', nodata=-32768)
+        p.update(
+            tiled=True, blockxsize=512, blockysize=512, interleave='band',
+            compress='zstd', zstd_level=1, predictor=2 if quantize else 3,
+            BIGTIFF='IF_SAFER'
+        )
+        with rasterio.open(output_path, 'w', **p) as ds:
+            for _, window in ds.block_windows(1):
+                rows, cols = window.toslices()
+                block = X[rows, cols]
+                if quantize:
+                    block = np.where(np.isnan(block), -32768, np.rint(block)).astype(np.int16)
+                ds.write(block, 1, window=window)
+            # Overviews let plot_dem() read a small preview instead of the full raster
+            ds.build_overviews([2, 4, 8, 16, 32], Resampling.average)
+            ds.update_tags(ns='rio_overview', resampling='average')
+
+    def _build_from_tile_cache(self, bounds, dem_name, output_path, overwrite=False, quantize=False,
+                               min_tile_cover=0.5):
+        """
+        Assembles the requested bounds from the per-tile (1°x1°) on-disk cache.
+
+        Missing or stale tiles are stitched one by one into 'tiles/{dem_name}_N42_E129.tif'.
+        Cells covered by less than 'min_tile_cover' of their area are not fetched whole:
+        only the overlap is stitched, into a part file named after its arc-second extent
+        (e.g. 'tiles/{dem_name}_N42_E129_p0360_1800_2520_3600.tif'), unless the full tile
+        is already cached.
+        The request itself is written as a VRT mosaic clipped to 'bounds' (no pixel copy).
+        Tiles are invalidated when the DEM source version recorded in 'tiles/index.json'
+        differs from the installed one.
+        """
+        index = self._load_tile_index()
+        version = self._dem_source_version()
+
+        def is_fresh(name):
+            entry = index.get(name)
+            return (not overwrite and entry is not None and entry.get("source_version") == version
+                    and (self.tile_cache_dir / name).exists())
+
+        tile_paths = []
+        reused = 0
+        for lon, lat in self._tiles_for_bounds(bounds):
+            cell = (lon, lat, lon + 1, lat + 1)
+            part = (max(bounds[0], lon), max(bounds[1], lat), min(bounds[2], lon + 1), min(bounds[3], lat + 1))
+            name = self._tile_name(dem_name, lon, lat, quantize)
+            tile_bounds = cell
+            if (part[2] - part[0]) * (part[3] - part[1]) < min_tile_cover and not is_fresh(name):
+                name = self._tile_name(dem_name, lon, lat, quantize, part=part)
+                tile_bounds = part
+            tile_path = self.tile_cache_dir / name
+
+            if not is_fresh(name) and tile_path.exists():
+                tile_path.unlink()
+
+            if tile_path.exists():
+                reused += 1
+            else:
+                if not self._stitch_geotiff(tile_bounds, dem_name, tile_path, quantize):
+                    return False
+                index[name] = {"source_version": version}
+                self._save_tile_index(index)
+
+            tile_paths.append(str(tile_path.resolve()))
+
+        print(f"   [Info] Tile cache: {reused}/{len(tile_paths)} tiles reused.")
+        try:
+            vrt = gdal.BuildVRT(str(output_path), tile_paths, outputBounds=bounds)
+            if vrt is None: return False
+            vrt = None # Flush VRT to disk
+            return True
+        except Exception as e:
+            print(f"[Error] Building DEM mosaic failed: {e}")
+            return False
+
+    @staticmethod
+    def _tiles_for_bounds(bounds):
+        """Lists the (lon, lat) lower-left corners of integer-degree tiles covering the bounds."""
+        minx, miny, maxx, maxy = bounds
+        return [(lon, lat)
+                for lat in range(math.floor(miny), math.ceil(maxy))
+                for lon in range(math.floor(minx), math.ceil(maxx))]
+
+    @staticmethod
+    def _tile_name(dem_name, lon, lat, quantize=False, part=None):
+        """
+        Builds the cache filename of a tile, e.g. 'glo_30_N42_E129.tif' ('..._i16.tif' if quantized).
+        A 'part' (minx, miny, maxx, maxy) inside the cell adds its offsets from the cell's
+        lower-left corner in arc-seconds, e.g. 'glo_30_N42_E129_p0360_1800_2520_3600.tif'.
+        """
+        ns = "N" if lat >= 0 else "S"
+        ew = "E" if lon >= 0 else "W"
+        extent = ""
+        if part is not None:
+            x0, y0, x1, y1 = (round((v - o) * 3600) for v, o in zip(part, (lon, lat, lon, lat)))
+            extent = f"_p{x0:04d}_{y0:04d}_{x1:04d}_{y1:04d}"
+        suffix = "_i16" if quantize else ""
+        return f"{dem_name}_{ns}{abs(lat):02d}_{ew}{abs(lon):03d}{extent}{suffix}.tif"
+
+    @staticmethod
+    def _dem_source_version():
+        """Returns the installed 'dem_stitcher' version used to tag cached tiles."""
+        try:
+            from importlib.metadata import version
+            return version("dem_stitcher")
+        except Exception:
+            return "unknown"
+
+    def _load_tile_index(self):
+        """Loads the tile cache sidecar (tile filename -> metadata)."""
+        index_path = self.tile_cache_dir / "index.json"
+        try:
+            return json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_tile_index(self, index):
+        """Writes the tile cache sidecar."""
+        (self.tile_cache_dir / "index.json").write_text(json.dumps(index, indent=2))
+
     def _convert_to_isce(self, input_tif, output_isce):
         """Converts a GeoTIFF file to the ISCE binary format using GDAL."""
         try:
@@ -310,20 +675,123 @@ class DEMManager(EarthdataAuth):
             print(f"[Error] ISCE Conversion failed: {e}")
             return False
 
+    def _write_vrt_dem(self, input_tif, vrt_path):
+        """
+        Writes a VRT wrapping the DEM plus the matching ISCE XML header ('<name>.xml').
+        topsApp reads the DEM through GDAL, so no pixels are copied.
+
+        A mosaic VRT (from 'fetch_dem') lives in 'temp_dir', so it is not referenced
+        directly: the export is rebuilt from its source tiles under 'tile_cache_dir',
+        on the same grid, and stays valid after the temp directory is cleaned.
+        """
+        input_tif = Path(input_tif).resolve()
+        vrt_path = Path(vrt_path)
+        try:
+            src = gdal.Open(str(input_tif), gdal.GA_ReadOnly)
+            if src is None: return False
+            gt = src.GetGeoTransform()
+            bounds = (gt[0], gt[3] + gt[5] * src.RasterYSize, gt[0] + gt[1] * src.RasterXSize, gt[3])
+            # GetFileList()[0] is the mosaic VRT itself, the rest are its tiles
+            sources = [f for f in (src.GetFileList() or [])[1:] if f.endswith('.tif')] \
+                if input_tif.suffix == ".vrt" else [str(input_tif)]
+            src = None
+
+            vrt = gdal.BuildVRT(str(vrt_path), sources or [str(input_tif)],
+                                outputBounds=bounds, xRes=gt[1], yRes=-gt[5])
+            if vrt is None: return False
+            width, length = vrt.RasterXSize, vrt.RasterYSize
+            vrt = None # Flush VRT to disk
+
+            with rasterio.open(vrt_path) as src:
+                transform, dtype = src.transform, src.dtypes[0]
+            xml_path = vrt_path.with_name(vrt_path.name + ".xml")
+            self._write_isce_xml(xml_path, vrt_path.name, width, length, transform, dtype)
+            return True
+        except Exception as e:
+            print(f"[Error] VRT export failed: {e}")
+            return False
+
+    @staticmethod
+    def _write_isce_xml(xml_path, file_name, width, length, transform, dtype):
+        """Writes a minimal ISCE image XML header for a north-up lat/lon DEM."""
+        data_type = {'int16': 'SHORT', 'float32': 'FLOAT', 'float64': 'DOUBLE'}[str(dtype)]
+
+        def prop(name, value, indent="    "):
+            return f'{indent}<property name="{name}"><value>{value}</value></property>\n'
+
+        def coord(name, delta, start, size, doc):
+            return (f'    <component name="{name}">\n'
+                    f'        <factorymodule>isceobj.Image</factorymodule>\n'
+                    f'        <factoryname>createCoordinate</factoryname>\n'
+                    f'        <doc>{doc}</doc>\n'
+                    + prop("delta", delta, " " * 8)
+                    + prop("endingvalue", start + delta * size, " " * 8)
+                    + prop("family", "imagecoordinate", " " * 8)
+                    + prop("name", "imagecoordinate_name", " " * 8)
+                    + prop("size", size, " " * 8)
+                    + prop("startingvalue", start, " " * 8)
+                    + '    </component>\n')
+
+        xml = ('<imageFile>\n'
+               + prop("ACCESS_MODE", "read")
+               + prop("BYTE_ORDER", "l")
+               + prop("DATA_TYPE", data_type)
+               + prop("FAMILY", "demimage")
+               + prop("FILE_NAME", file_name)
+               + prop("IMAGE_TYPE", "dem")
+               + prop("LENGTH", length)
+               + prop("NUMBER_BANDS", 1)
+               + prop("REFERENCE", "WGS84")
+               + prop("SCHEME", "BIP")
+               + prop("WIDTH", width)
+               + prop("XMAX", transform.c + transform.a * width)
+               + prop("XMIN", transform.c)
+               + coord("coordinate1", transform.a, transform.c, width, "First coordinate of a 2D image (width).")
+               + coord("coordinate2", transform.e, transform.f, length, "Second coordinate of a 2D image (length).")
+               + '</imageFile>\n')
+        Path(xml_path).write_text(xml)
+
     def _is_valid_isce_file(self, path):
         """
         Performs a lightweight integrity check on the ISCE file.
-        Checks for: file existence, non-zero size, XML metadata, and valid GDAL header.
+        Checks for: file existence, non-zero size, XML metadata, and that GDAL can read
+        a pixel (for VRTs this also requires every referenced tile to exist).
+
+        The GDAL check is cached per (path, mtime, size), so repeated pipeline runs
+        do not re-open an unchanged multi-GB file.
         """
         path = Path(path)
-        if not path.exists() or path.stat().st_size < 1024: return False
-        if not path.with_suffix(".wgs84.xml").exists(): return False
+        if not path.exists(): return False
+        st = path.stat()
+        # VRT exports are small text files (size check applies to raw binaries only)
+        if path.suffix != ".vrt" and st.st_size < 1024: return False
+        if not path.with_name(path.name + ".xml").exists(): return False
+
+        # A VRT is cheap to open, but its tiles can vanish without touching the VRT
+        # itself, so it is re-checked every time instead of cached by its own mtime
+        if path.suffix == ".vrt": return self._is_readable(path)
+
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with self._valid_lock:
+            if key in self._valid_cache:
+                return self._valid_cache[key]
+
+        valid = self._is_readable(path)
+
+        with self._valid_lock:
+            self._valid_cache[key] = valid
+        return valid
+
+    @staticmethod
+    def _is_readable(path):
+        """Opens a raster with GDAL and reads one pixel (all referenced files must exist)."""
         try:
             ds = gdal.Open(str(path), gdal.GA_ReadOnly)
             if ds is None: return False
-            ds = None
-            return True
-        except: return False
+            if not all(os.path.exists(f) for f in (ds.GetFileList() or [])): return False
+            return ds.GetRasterBand(1).ReadRaster(0, 0, 1, 1) is not None
+        except Exception:
+            return False
 
     def _add_buffer(self, bounds, buffer):
         """Adds a buffer (margin) to the bounding box coordinates."""
@@ -341,10 +809,11 @@ class DEMManager(EarthdataAuth):
             return None
         
         # Helper: Safely extract geometry regardless of object type
-        def get_geometry(scene):
-            # Case 1: asf_search object (geojson is a method)
+        def extract_geometry(scene):
+            # Case 1: asf_search object or MockResult (geojson is a method)
             if hasattr(scene, 'geojson') and callable(scene.geojson):
-                return shape(scene.geojson()['geometry'])
+                feature = scene.geojson()
+                if feature: return shape(feature['geometry'])
             
             # Case 2: Mock object (geojson is a dict/property)
             if hasattr(scene, 'geojson') and isinstance(scene.geojson, dict):
@@ -356,6 +825,20 @@ class DEMManager(EarthdataAuth):
 
             return None
 
+        # Helper: Memoized by scene name (published SAFE footprints never change)
+        # Scenes without a stable name/ID are not cached (id() values are reused after GC)
+        def get_geometry(scene):
+            props = getattr(scene, 'properties', None) or {}
+            scene_id = props.get('sceneName') or props.get('fileID')
+            if scene_id is None:
+                return extract_geometry(scene)
+            geom = self._geom_cache.get(scene_id)
+            if geom is None:
+                geom = extract_geometry(scene)
+                if geom is not None:
+                    self._geom_cache[scene_id] = geom
+            return geom
+
         # 1. Master Geometry
         master_geom = get_geometry(slc_manager.master_scene)
         if master_geom is None:
@@ -367,19 +850,22 @@ class DEMManager(EarthdataAuth):
         if not slave_indices:
             return master_geom.bounds
 
-        slave_geoms = []
-        for idx in slave_indices:
-            if idx == slc_manager.master_idx: continue
-            
-            s_geom = get_geometry(slc_manager.results[idx])
-            if s_geom:
-                slave_geoms.append(s_geom)
+        # Extract footprints concurrently (JSON -> shapely conversion per scene)
+        slave_scenes = [slc_manager.results[idx] for idx in slave_indices if idx != slc_manager.master_idx]
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            slave_geoms = [g for g in ex.map(get_geometry, slave_scenes) if g]
 
         # 3. Intersection Calculation
         if not slave_geoms:
             return master_geom.bounds
 
-        slaves_union = unary_union(slave_geoms)
+        # Prune slaves whose footprint cannot touch the master before building the union
+        tree = STRtree(slave_geoms)
+        candidates = [slave_geoms[i] for i in tree.query(master_geom, predicate='intersects')]
+        if not candidates:
+            return None
+
+        slaves_union = unary_union(candidates)
         common_area = master_geom.intersection(slaves_union)
         
         return common_area.bounds if not common_area.is_empty else None
\ No newline at end of file
@@ -1,13 +1,64 @@
 import os
+import re
 import glob
+import json
+import time
+import hashlib
+import shutil
+import zipfile
+import queue
+import threading
+import asyncio
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import asf_search as asf
+import joblib
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 from pathlib import Path
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
 from modules.auth_base import EarthdataAuth
 
+# S1A_IW_SLC__1SDV_20220101T000000_... -> (Platform, YYYYMMDD)
+_S1_RE = re.compile(r'^(S1[A-Z])_IW_SLC__[^_]+_(\d{8})T\d{6}_')
+
+# Filesystem-backed memo for ASF baseline stacks (shared by all managers)
+# Lives in the user cache dir, so it hits regardless of the launch directory; DINSAR_CACHE overrides
+_CACHE_DIR = os.environ.get('DINSAR_CACHE') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'dinsar')
+memory = joblib.Memory(location=_CACHE_DIR, verbose=0)
+
+@memory.cache
+def _fetch_stack(master_fileid):
+    """
+    Fetches the baseline stack of a master product from ASF.
+
+    Keyed only on the fileID string, and returns plain (fileID, perpendicularBaseline)
+    tuples so joblib pickles cheap data instead of ASF result objects. The fetch time
+    is stored with them, since joblib only tracks last access.
+
+    Returns:
+        tuple: (fetched_at, stack) with fetched_at as a UNIX timestamp.
+    """
+    master = asf.product_search(product_list=[master_fileid])[0]
+    return time.time(), [(item.properties['fileID'], item.properties['perpendicularBaseline'])
+                         for item in asf.baseline_search.stack_from_product(master)
+                         if item.properties.get('perpendicularBaseline') is not None]
+
+class MockResult:
+    """Minimal stand-in for asf_search results (local scans and cached searches)."""
+    def __init__(self, props, geojson=None):
+        self.properties = props
+        self._geojson = geojson
+
+    def geojson(self):
+        """Returns the GeoJSON feature (None for local scans), like ASFProduct.geojson()."""
+        return self._geojson
+
 class S1SLCManager(EarthdataAuth):
     """
     Manages Sentinel-1 SLC data acquisition and preparation for InSAR processing.
@@ -27,9 +78,12 @@ class S1SLCManager(EarthdataAuth):
         master_idx (int): Index of the selected Master scene.
         selected_indices (set): Set of indices selected for processing (Slaves).
         downloaded_files (list): List of filenames successfully downloaded or verified.
+        stage_mode (str): 'full' downloads SAFE zips, 'vrt' stages bursts via remote VRTs.
+        staged_vrts (dict): Mapping of staged SAFE names to their measurement VRT paths.
+        verbose (bool): If False, status messages are suppressed (errors and warnings are still printed).
     """
 
-    def __init__(self, roi_wkt=None, data_dir="raw_data"):
+    def __init__(self, roi_wkt=None, data_dir="raw_data", stage_mode="full", cache_ttl_days=7, verbose=True):
         """
         Initialize the S1SLCManager.
 
@@ -38,7 +92,15 @@ class S1SLCManager(EarthdataAuth):
                                      Can be None if only using 'scan_local_directory'.
             data_dir (str): Directory path where SLC files will be downloaded or scanned.
                             Defaults to "raw_data".
+            stage_mode (str): 'full' to download complete SAFE zips (default), or 'vrt' to
+                              fetch only annotations and stage ROI bursts as remote VRTs.
+            cache_ttl_days (float): Age after which cached search/baseline results in
+                                    'data_dir/.cache' are refreshed. Defaults to 7.
+            verbose (bool): If False, only '[Error]' and '[Warning]' messages are printed. Defaults to True.
         """
+        if stage_mode not in ("full", "vrt"):
+            raise ValueError(f"stage_mode must be 'full' or 'vrt', got '{stage_mode}'")
+        self.verbose = verbose
         super().__init__()
         self.roi = roi_wkt
         self.data_dir = Path(data_dir)
@@ -54,6 +116,19 @@ class S1SLCManager(EarthdataAuth):
         self.selected_indices = set()
         self.downloaded_files = [] 
 
+        self.stage_mode = stage_mode
+        self.staged_vrts = {}
+
+        self.cache_ttl_days = cache_ttl_days
+        self._pairs_cache = OrderedDict()   # Small LRU for 'get_pairs' (cleared by setters)
+        self._dirty_baseline = False        # stack_df no longer matches the current master
+        self._id_to_idx = {}                # Scene ID -> search_df index (rebuilt with search_df)
+        self._all_indices = frozenset()     # Master + selection (read-only, rebuilt by setters)
+
+    def _log(self, msg):
+        """Prints a status message unless 'verbose' is off ('[Error]'/'[Warning]' messages always print)."""
+        if self.verbose or "[Error]" in msg or "[Warning]" in msg: print(msg)
+
     # --------------------------------------------------------------------------
     # 0. Interface for Loose Coupling
     # --------------------------------------------------------------------------
@@ -71,7 +146,7 @@ class S1SLCManager(EarthdataAuth):
         master_id = self.compatible_df.loc[self.master_idx, 'Scene ID'] if self.master_idx is not None else None
         
         # [FIX] Master Index가 선택 목록에 포함되어 있을 경우를 대비해 제외하고 카운트
-        actual_slaves = [i for i in self.selected_indices if i != self.master_idx]
+        actual_slaves = self._all_indices - {self.master_idx}
         
         return {
             "module_name": "S1SLCManager",
@@ -79,7 +154,9 @@ class S1SLCManager(EarthdataAuth):
             "data_dir": str(self.data_dir.resolve()),
             "master_id": master_id,
             "slave_count": len(actual_slaves), # 수정된 카운트 반영
-            "pairs": pairs_list
+            "pairs": pairs_list,
+            "stage_mode": self.stage_mode,
+            "vrt_files": self.staged_vrts
         }
     # --------------------------------------------------------------------------
     # 1. Search & Local Scan
@@ -98,7 +175,21 @@ class S1SLCManager(EarthdataAuth):
                           Returns None if the search fails.
         """
         direction_log = orbit_direction if orbit_direction else "ALL"
-        print(f"[Search] API Search Sentinel-1 SLC ({start_date} ~ {end_date}) | {direction_log}...")
+
+        # Disk cache: identical queries skip the API round-trip entirely
+        cache = self._cache_path("search", (self.roi, start_date, end_date, orbit_direction))
+        cached = self._read_cache(cache)
+        if cached is not None:
+            self.results = [MockResult(json.loads(p), json.loads(g))
+                            for p, g in zip(cached.pop('_props'), cached.pop('_geojson'))]
+            self.search_df = cached
+            self._pairs_cache.clear()
+            self._index_scene_ids()
+            self.compatible_df = self.search_df.copy()
+            self._log(f"[Search] Loaded {len(self.results)} scenes from cache ({cache.name}).")
+            return self.compatible_df
+
+        self._log(f"[Search] API Search Sentinel-1 SLC ({start_date} ~ {end_date}) | {direction_log}...")
         
         try:
             self.results = asf.geo_search(
@@ -111,9 +202,13 @@ class S1SLCManager(EarthdataAuth):
                 beamMode=asf.BEAMMODE.IW
             )
             self._results_to_df()
+            self._write_cache(cache, self.search_df.assign(
+                _props=[json.dumps(r.properties, default=str) for r in self.results],
+                _geojson=[json.dumps(r.geojson(), default=str) for r in self.results]
+            ))
             return self.compatible_df
         except Exception as e:
-            print(f"[Error] API Search failed: {e}")
+            self._log(f"[Error] API Search failed: {e}")
             return None
 
     def scan_local_directory(self, dir_path=None):
@@ -134,75 +229,86 @@ class S1SLCManager(EarthdataAuth):
         target_dir = Path(dir_path) if dir_path else self.data_dir
         
         if not target_dir.exists():
-            print(f"[Error] Directory not found: {target_dir}")
+            self._log(f"[Error] Directory not found: {target_dir}")
             return
 
-        # Matches standard S1 naming convention (S1A, S1B, S1C...)
-        zip_files = sorted(list(target_dir.glob("S1*_IW_SLC__*.zip")))
-        print(f"[Scan] Found {len(zip_files)} SLC files in '{target_dir}'")
+        # Matches standard S1 naming convention (S1A, S1B, S1C...) in one scandir pass
+        with os.scandir(target_dir) as it:
+            zip_files = sorted(e.path for e in it if e.name.startswith('S1') and e.name.endswith('.zip')
+                               and '_IW_SLC__' in e.name and e.is_file())
+        self._log(f"[Scan] Found {len(zip_files)} SLC files in '{target_dir}'")
 
-        data = []
-        for i, f in enumerate(zip_files):
-            try:
-                # Parse filename: S1A_IW_SLC__1SDV_20220101T000000_...
-                fname = f.name
-                parts = fname.split('_')
-                # parts[0]=Platform, parts[5]=StartDateTime (standard format)
-                platform = parts[0]
-                date_str = parts[5][:8] # YYYYMMDD
-                dt = pd.to_datetime(date_str)
-                
-                data.append({
-                    'Index': i,
-                    'Date': dt,
-                    'Scene ID': fname, 
-                    'Orbit': -1,       # Unknown in local mode
-                    'Path': -1,        # Unknown in local mode
-                    'Frame': -1,       # Unknown in local mode
-                    'Flight Dir': 'Unknown',
-                    'Platform': platform,
-                    'Local Path': str(f)
-                })
-            except Exception as e:
-                print(f"[Warning] Skipping malformed file: {f.name} ({e})")
+        # Parse filenames in one vectorized regex pass (non-matching names yield NaN)
+        names = pd.Series([os.path.basename(f) for f in zip_files], dtype=object)
+        parts = names.str.extract(_S1_RE)
+        dates = pd.to_datetime(parts[1], format='%Y%m%d', errors='coerce', cache=True)
 
-        if not data:
-            print("[Scan] No valid Sentinel-1 SLCs found.")
+        malformed = dates.isna()
+        for fname in names[malformed]:
+            self._log(f"[Warning] Skipping malformed file: {fname}")
+
+        if malformed.all():
+            self._log("[Scan] No valid Sentinel-1 SLCs found.")
             return
 
-        self.search_df = pd.DataFrame(data).set_index('Index')
+        n = len(names)
+        df = pd.DataFrame({
+            'Date': dates,
+            'Scene ID': names,
+            'Orbit': np.full(n, -1),            # Unknown in local mode
+            'Path': np.full(n, -1),             # Unknown in local mode
+            'Frame': np.full(n, -1),            # Unknown in local mode
+            'Flight Dir': np.full(n, 'Unknown', dtype=object),
+            'Platform': parts[0],
+            'Local Path': zip_files
+        })
+        df.index.name = 'Index'
+        self.search_df = self._compact_dtypes(df[~malformed])
+        self._pairs_cache.clear()
+        self._index_scene_ids()
         self.compatible_df = self.search_df.copy()
         
         # Create MockResult objects to maintain compatibility with other methods
-        class MockResult:
-            def __init__(self, props): self.properties = props
-            
-        self.results = [MockResult({'fileID': d['Scene ID'], 'fileName': d['Scene ID'], 'url': '', 'startTime': d['Date']}) 
-                        for d in data]
+        self.results = [MockResult({'fileID': sid, 'fileName': sid, 'url': '', 'startTime': dt}) 
+                        for sid, dt in zip(self.search_df['Scene ID'], self.search_df['Date'])]
         
-        print("[Scan] Local database populated. (Note: Path/Orbit info is limited)")
+        self._log("[Scan] Local database populated. (Note: Path/Orbit info is limited)")
         return self.compatible_df
 
     def _results_to_df(self):
-        """Internal helper to convert ASF API results to DataFrame."""
-        data = []
-        for i, res in enumerate(self.results):
-            props = res.properties
-            data.append({
-                'Index': i,
-                'Date': pd.to_datetime(props['startTime']),
-                'Scene ID': props['fileID'],
-                'Orbit': props['orbit'],
-                'Path': props.get('pathNumber'),    
-                'Frame': props.get('frameNumber'),
-                'Flight Dir': props['flightDirection'],
-                'Platform': props.get('platform', 'S1').replace('Sentinel-1', 'S1'),
-                'Local Path': None
-            })
-        
-        self.search_df = pd.DataFrame(data).set_index('Index')
+        """Internal helper to convert ASF API results to DataFrame (built column-wise)."""
+        props = [res.properties for res in self.results]
+        self.search_df = pd.DataFrame({
+            'Date': pd.to_datetime([p['startTime'] for p in props]),
+            'Scene ID': [p['fileID'] for p in props],
+            'Orbit': [p['orbit'] for p in props],
+            'Path': [p.get('pathNumber') for p in props],
+            'Frame': [p.get('frameNumber') for p in props],
+            'Flight Dir': [p['flightDirection'] for p in props],
+            'Platform': [p.get('platform', 'S1').replace('Sentinel-1', 'S1') for p in props],
+            'Local Path': [None] * len(props)
+        }, index=pd.RangeIndex(len(props), name='Index'))
+        self.search_df = self._compact_dtypes(self.search_df)
+        self._pairs_cache.clear()
+        self._index_scene_ids()
         self.compatible_df = self.search_df.copy()
-        print(f"[Search] Found {len(self.results)} scenes.")
+        self._log(f"[Search] Found {len(self.results)} scenes.")
+
+    @staticmethod
+    def _compact_dtypes(df):
+        """Internal helper storing low-cardinality columns as categories and IDs as nullable Int32."""
+        df = df.copy()
+        for col in ('Platform', 'Flight Dir'): df[col] = df[col].astype('category')
+        for col in ('Path', 'Frame', 'Orbit'): df[col] = df[col].astype('Int32')
+        return df
+
+    def _index_scene_ids(self):
+        """Internal helper rebuilding the Scene ID -> index lookup after search_df changes."""
+        self._id_to_idx = dict(zip(self.search_df['Scene ID'].tolist(), self.search_df.index.tolist()))
+
+    def _is_local_mode(self):
+        """Internal helper: True if search_df came from 'scan_local_directory' (Path == -1)."""
+        return bool(self.search_df['Path'].iloc[:1].eq(-1).any())
 
     # --------------------------------------------------------------------------
     # 2. Master & Pairing
@@ -218,29 +324,35 @@ class S1SLCManager(EarthdataAuth):
             pd.DataFrame: Filtered DataFrame containing only compatible scenes (same Path).
         """
         if index not in self.search_df.index:
-            print(f"[Error] Index {index} not found.")
+            self._log(f"[Error] Index {index} not found.")
             return
         
         self.master_idx = index
         self.master_scene = self.results[index]
+        self._selection_changed()
+        # B_perp for the new master is derived lazily on the next read (see '_sync_baseline')
+        self.stack_df = None
+        self._dirty_baseline = True
         
         # 1. Filter by Path (if metadata is available)
         master_path = self.search_df.loc[index, 'Path']
-        if master_path != -1:
-            self.compatible_df = self.search_df[self.search_df['Path'] == master_path].copy()
-            filtered = len(self.search_df) - len(self.compatible_df)
-            print(f"[Master] Set to Idx {index}. Filtered {filtered} incompatible scenes (Path {master_path}).")
+        if pd.notna(master_path) and master_path != -1:
+            # Plain boolean mask (no index alignment); the frame is materialized once below
+            mask = self.search_df['Path'].eq(master_path).to_numpy(dtype=bool, na_value=False)
+            compatible = self.search_df.loc[mask]
+            filtered = len(self.search_df) - len(compatible)
+            self._log(f"[Master] Set to Idx {index}. Filtered {filtered} incompatible scenes (Path {master_path}).")
         else:
-            print(f"[Master] Set to Idx {index}. (Local Mode: Path filtering skipped)")
-            self.compatible_df = self.search_df.copy()
+            self._log(f"[Master] Set to Idx {index}. (Local Mode: Path filtering skipped)")
+            compatible = self.search_df
 
         # 2. Calculate Temporal Baseline immediately
-        master_date = self.compatible_df.loc[self.master_idx, 'Date']
-        self.compatible_df['B_temp_days'] = (self.compatible_df['Date'] - master_date).dt.days
-        
-        # Initialize B_perp_m with NaN (will be filled by get_stack_info later)
-        if 'B_perp_m' not in self.compatible_df.columns:
-            self.compatible_df['B_perp_m'] = float('nan')
+        # B_perp_m starts as NaN (will be filled by get_stack_info later)
+        master_date = compatible.loc[self.master_idx, 'Date']
+        self.compatible_df = compatible.assign(
+            B_temp_days=(compatible['Date'] - master_date).dt.days.astype('int32'),
+            B_perp_m=np.nan
+        )
 
         return self.compatible_df
 
@@ -252,18 +364,20 @@ class S1SLCManager(EarthdataAuth):
             pd.DataFrame: The restored full DataFrame with all scenes.
         """
         if self.master_idx is None:
-            print("[Info] Master is already unset.")
+            self._log("[Info] Master is already unset.")
             return
 
-        print(f"[Master] Unsetting Master (Index {self.master_idx})...")
+        self._log(f"[Master] Unsetting Master (Index {self.master_idx})...")
         self.master_idx = None
         self.master_scene = None
+        self._selection_changed()
         self.stack_df = None 
+        self._dirty_baseline = False
         
         # Restore compatible_df to full list
         self.compatible_df = self.search_df.copy()
         
-        print(f"[Reset] List restored. View type reverted to 'Selected'.")
+        self._log(f"[Reset] List restored. View type reverted to 'Selected'.")
         return self.compatible_df
 
     def get_master(self):
@@ -279,6 +393,7 @@ class S1SLCManager(EarthdataAuth):
     def get_pairs(self, full_path=False):
         """
         Generate (Master, Slave) filename tuples for ISCE processing.
+        In 'vrt' stage mode, the staged SAFE directory names are returned instead of zips.
 
         Args:
             full_path (bool): If True, returns absolute paths. If False, returns filenames.
@@ -295,24 +410,40 @@ class S1SLCManager(EarthdataAuth):
             # print("[Error] No Slaves selected.") # Silent return
             return []
 
-        master_name = self.compatible_df.loc[self.master_idx, 'Scene ID']
-        if not master_name.endswith('.zip'): master_name += '.zip'
+        key = (self.master_idx, self._all_indices, full_path, str(self.data_dir), self.stage_mode)
+        if key in self._pairs_cache:
+            self._pairs_cache.move_to_end(key)
+            return list(self._pairs_cache[key])
+
+        # Plain dict lookups instead of per-scene .loc indexing
+        ids = self.compatible_df['Scene ID'].to_dict()
+        master_name = self._pair_name(self.master_idx, ids)
+        base = self.data_dir.resolve()
+        m_path = os.fspath(base / master_name)
         
         pairs = []
-        for idx in sorted(list(self.selected_indices)):
+        for idx in sorted(self._all_indices):
             if idx == self.master_idx: continue
             
-            slave_name = self.compatible_df.loc[idx, 'Scene ID']
-            if not slave_name.endswith('.zip'): slave_name += '.zip'
+            slave_name = self._pair_name(idx, ids)
             
             if full_path:
-                m_path = str(self.data_dir.resolve() / master_name)
-                s_path = str(self.data_dir.resolve() / slave_name)
-                pairs.append((m_path, s_path))
+                pairs.append((m_path, os.fspath(base / slave_name)))
             else:
                 pairs.append((master_name, slave_name))
-            
-        return pairs
+
+        self._pairs_cache[key] = pairs
+        if len(self._pairs_cache) > 4: self._pairs_cache.popitem(last=False)
+        return list(pairs)
+
+    def _pair_name(self, idx, ids):
+        """Internal helper returning the on-disk name (zip or staged SAFE) of a scene."""
+        if self.stage_mode == "vrt":
+            return self._safe_name(self.results[idx])
+
+        name = ids[idx]
+        if not name.endswith('.zip'): name += '.zip'
+        return name
 
     # --------------------------------------------------------------------------
     # 3. Baseline Analysis
@@ -328,39 +459,126 @@ class S1SLCManager(EarthdataAuth):
             pd.DataFrame: DataFrame with 'B_perp_m' and 'B_temp_days' columns.
         """
         if self.master_idx is None:
-            print("[Warning] Set master first.")
+            self._log("[Warning] Set master first.")
             return None
         
         # Check for Local Mode (Path == -1)
-        is_local = (self.search_df.iloc[0]['Path'] == -1)
+        is_local = self._is_local_mode()
 
         if is_local:
-            print("[Warning] Local Mode: B_perp cannot be calculated via API.")
-            print("          Setting B_perp_m to 0.0.")
+            self._log("[Warning] Local Mode: B_perp cannot be calculated via API.")
+            self._log("          Setting B_perp_m to 0.0.")
             self.compatible_df['B_perp_m'] = 0.0
             self.stack_df = self.compatible_df
             return self.stack_df
 
-        print(f"[Baseline] Calculating B_perp for {len(self.compatible_df)} scenes...")
+        self._log(f"[Baseline] Calculating B_perp for {len(self.compatible_df)} scenes...")
         try:
-            stack_results = asf.baseline_search.stack_from_product(self.master_scene)
-            baseline_map = {item.properties['fileID']: item.properties['perpendicularBaseline'] 
-                            for item in stack_results if 'perpendicularBaseline' in item.properties}
-            
-            df = self.compatible_df.copy()
-            df['B_perp_m'] = df['Scene ID'].map(baseline_map).fillna(0)
-            
-            # Recalculate B_temp to be safe
-            master_date = df.loc[self.master_idx, 'Date']
-            df['B_temp_days'] = (df['Date'] - master_date).dt.days
-            
-            self.stack_df = df
+            # joblib disk memo keyed by the master fileID (refetched once expired)
+            stack = self._load_stack(self.master_scene.properties['fileID'])
+            self.stack_df = self._join_baselines(stack)
+            self._dirty_baseline = False
         except Exception as e:
-            print(f"[Error] Baseline calculation failed: {e}")
+            self._log(f"[Error] Baseline calculation failed: {e}")
             self.stack_df = self.compatible_df
             
         return self.stack_df
 
+    def _join_baselines(self, stack):
+        """Internal helper joining (Scene ID, B_perp_m) pairs onto compatible_df with B_temp."""
+        # Scene ID -> index via the prebuilt dict, then one positional assignment (missing = 0)
+        df = self.compatible_df.copy()
+        labels, values = [], []
+        for sid, bp in stack:
+            idx = self._id_to_idx.get(sid)
+            if idx is not None:
+                labels.append(idx)
+                values.append(bp)
+        pos = df.index.get_indexer(labels)
+        keep = pos >= 0
+        bperp = np.zeros(len(df))
+        bperp[pos[keep]] = np.asarray(values, dtype=float)[keep]
+        df['B_perp_m'] = bperp
+        
+        # Recalculate B_temp to be safe
+        master_date = df.loc[self.master_idx, 'Date']
+        df['B_temp_days'] = (df['Date'] - master_date).dt.days
+        return df
+
+    def _sync_baseline(self):
+        """
+        Internal helper: lazily re-derives stack_df after the master changed.
+
+        Runs only on read paths (view/plot) and never touches the network: if baselines
+        for the current master are in the disk cache they are joined, otherwise the
+        B_perp_m column stays NaN until 'get_stack_info()' is called.
+        """
+        if not self._dirty_baseline: return
+        self._dirty_baseline = False
+        if self.master_idx is None or self._is_local_mode(): return
+        stack = self._load_stack(self.master_scene.properties['fileID'], fetch=False)
+        if stack is not None:
+            self.stack_df = self._join_baselines(stack)
+
+    # --------------------------------------------------------------------------
+    # 3-1. Disk Cache (Search; baselines are memoized by '_fetch_stack')
+    # --------------------------------------------------------------------------
+    def _cache_path(self, kind, key):
+        """Returns the parquet cache file for a query, e.g. 'data_dir/.cache/search_<sha1>.parquet'."""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return self.data_dir / ".cache" / f"{kind}_{digest}.parquet"
+
+    def _read_cache(self, path):
+        """Loads a cached DataFrame, or returns None if missing, expired, or unreadable."""
+        if not path.exists(): return None
+        if time.time() - path.stat().st_mtime > self.cache_ttl_days * 86400: return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            self._log(f"[Warning] Ignoring unreadable cache {path.name}: {e}")
+            return None
+
+    def _write_cache(self, path, df):
+        """Stores a DataFrame as parquet (failures only disable caching)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(path)
+        except Exception as e:
+            self._log(f"[Warning] Could not write cache {path.name}: {e}")
+
+    def _load_stack(self, master_id, fetch=True):
+        """
+        Returns the memoized baseline stack of a master, refetching it once it is older
+        than 'cache_ttl_days' (new acquisitions extend stacks).
+
+        Age is measured from the fetch time stored with the result, not from joblib's
+        last-access time, so a master queried regularly still expires.
+
+        Args:
+            master_id (str): fileID of the master product.
+            fetch (bool): If False, never calls ASF and returns None for a missing or
+                          expired entry.
+
+        Returns:
+            list or None: (fileID, perpendicularBaseline) tuples.
+        """
+        if _fetch_stack.check_call_in_cache(master_id):
+            shelved = _fetch_stack.call_and_shelve(master_id)
+            fetched_at, stack = shelved.get()
+            if time.time() - fetched_at <= self.cache_ttl_days * 86400:
+                return stack
+            shelved.clear() # Expired: drop only this master's entry
+        if not fetch: return None
+        return _fetch_stack(master_id)[1]
+
+    def clear_cache(self):
+        """Removes all cached search and baseline results."""
+        cache_dir = self.data_dir / ".cache"
+        files = list(cache_dir.glob("*.parquet")) if cache_dir.exists() else []
+        for f in files: f.unlink()
+        _fetch_stack.clear(warn=False)
+        self._log(f"[Cache] Removed {len(files)} cached searches and all baseline stacks.")
+
     # --------------------------------------------------------------------------
     # 4. Selection & Download
     # --------------------------------------------------------------------------
@@ -372,12 +590,13 @@ class S1SLCManager(EarthdataAuth):
             indices (int or list): Index (or list of indices) to select.
         """
         if isinstance(indices, int): indices = [indices]
-        for idx in indices:
-            if idx in self.compatible_df.index:
-                self.selected_indices.add(idx)
-                print(f"[Select] Added Index {idx}")
-            else:
-                print(f"[Warning] Index {idx} invalid.")
+        # One index-validity check for the whole batch, one summary line
+        valid = self.compatible_df.index.intersection(indices).tolist()
+        invalid = sorted(set(indices).difference(valid))
+        self.selected_indices.update(valid)
+        self._selection_changed()
+        if valid: self._log(f"[Select] Added {len(valid)} indices: {self._fmt_indices(valid)}")
+        if invalid: self._log(f"[Warning] {len(invalid)} invalid indices skipped: {self._fmt_indices(invalid)}")
 
     def remove_selected(self, indices):
         """
@@ -387,14 +606,27 @@ class S1SLCManager(EarthdataAuth):
             indices (int or list): Index (or list of indices) to deselect.
         """
         if isinstance(indices, int): indices = [indices]
-        for idx in indices:
-            self.selected_indices.discard(idx)
-            print(f"[Select] Removed Index {idx}")
+        removed = sorted(self.selected_indices.intersection(indices))
+        self.selected_indices.difference_update(removed)
+        self._selection_changed()
+        self._log(f"[Select] Removed {len(removed)} indices: {self._fmt_indices(removed)}")
 
     def purge_selected(self):
         """Clear all selected indices."""
         self.selected_indices.clear()
-        print("[Select] Selection cleared.")
+        self._selection_changed()
+        self._log("[Select] Selection cleared.")
+
+    def _selection_changed(self):
+        """Internal helper run by every Master/selection setter: drops memoized pairs, rebuilds '_all_indices'."""
+        self._pairs_cache.clear()
+        master = {self.master_idx} if self.master_idx is not None else set()
+        self._all_indices = frozenset(self.selected_indices | master)
+
+    @staticmethod
+    def _fmt_indices(indices, limit=5):
+        """Internal helper abbreviating an index list for log lines, e.g. '[1, 2, 3, 4, 5, ...]'."""
+        return f"{list(indices[:limit])}"[:-1] + (", ...]" if len(indices) > limit else "]")
 
     def view_selected(self):
         """
@@ -404,123 +636,536 @@ class S1SLCManager(EarthdataAuth):
         Returns:
             pd.DataFrame: View of selected scenes.
         """
-        all_idxs = self.selected_indices.copy()
-        if self.master_idx is not None: all_idxs.add(self.master_idx)
+        all_idxs = self._all_indices
         
         if not all_idxs: return pd.DataFrame()
         
         # Prefer stack_df if available
+        self._sync_baseline()
         source = self.stack_df if self.stack_df is not None else self.compatible_df
         
-        valid_idxs = [i for i in sorted(list(all_idxs)) if i in source.index]
+        valid_idxs = [i for i in sorted(all_idxs) if i in source.index]
         view_df = source.loc[valid_idxs].copy()
         
-        type_col = []
-        for idx in view_df.index:
-            # 1. Master Case
-            if self.master_idx is not None and idx == self.master_idx:
-                type_col.append("MASTER")
-            
-            # 2. Slave Case
-            elif self.master_idx is not None:
-                parts = []
-                
-                # Check Temporal Baseline
-                if 'B_temp_days' in view_df.columns and pd.notnull(view_df.loc[idx, 'B_temp_days']):
-                      parts.append(f"{int(view_df.loc[idx, 'B_temp_days']):+d}d")
-                
-                # Check Perpendicular Baseline
-                if 'B_perp_m' in view_df.columns and pd.notnull(view_df.loc[idx, 'B_perp_m']):
-                    parts.append(f"{view_df.loc[idx, 'B_perp_m']:.1f}m")
-                
-                info_str = f"({', '.join(parts)})" if parts else ""
-                type_col.append(f"Slave {info_str}")
-            
-            # 3. No Master Case
-            else:
-                type_col.append("Selected")
-                
+        # No Master Case
+        if self.master_idx is None:
+            view_df.insert(0, 'Type', "Selected")
+            return view_df
+
+        # Slave Case: baseline strings built column-wise ('' where unavailable)
+        empty = pd.Series('', index=view_df.index)
+        t_str, p_str = empty, empty
+        if 'B_temp_days' in view_df.columns:
+            bt = view_df['B_temp_days'].dropna().astype(int)
+            t_str = bt.map('{:+d}d'.format).reindex(view_df.index, fill_value='')
+        if 'B_perp_m' in view_df.columns:
+            p_str = view_df['B_perp_m'].dropna().map('{:.1f}m'.format).reindex(view_df.index, fill_value='')
+
+        has_t, has_p = t_str != '', p_str != ''
+        sep = pd.Series(np.where(has_t & has_p, ', ', ''), index=view_df.index)
+        info = ('(' + t_str + sep + p_str + ')').where(has_t | has_p, '')
+        type_col = np.where(view_df.index == self.master_idx, "MASTER", 'Slave ' + info)
+
         view_df.insert(0, 'Type', type_col)
         return view_df
 
-    def download_selected(self, download_dir=None):
+    def download_selected(self, download_dir=None, max_workers=4, n_parts=1, verify=True, check_crc=False):
         """
         Download or verify selected scenes.
 
+        In API mode, files are downloaded in parallel by a bounded thread pool
+        (each worker with its own progress bar). Every worker opens 'n_parts' HTTP
+        streams, so at most 'max_workers * n_parts' flows are open at once.
+
         Args:
             download_dir (str, optional): Directory path to save/check files.
                                           If None, uses self.data_dir.
+            max_workers (int): Number of files downloaded in parallel. Defaults to 4.
+            n_parts (int): HTTP Range segments fetched in parallel per file. Defaults to 1 (disabled),
+                           since ASF limits concurrent flows per user; raise it for other hosts.
+            verify (bool): Check existing zips with 'verify_existing()' first. Defaults to True.
+            check_crc (bool): Also CRC-check existing zips (reads every byte). Defaults to False.
 
         Returns:
             list: List of valid filenames found or downloaded.
         """
+        if self.stage_mode == "vrt":
+            return list(self.stage_burst_vrts(download_dir=download_dir))
+
         target_dir = Path(download_dir) if download_dir else self.data_dir
         
-        to_dl = self.selected_indices.copy()
-        if self.master_idx is not None: to_dl.add(self.master_idx)
+        to_dl = self._all_indices
         
         if not to_dl:
-            print("[Error] Nothing to download.")
+            self._log("[Error] Nothing to download.")
             return []
         
         # Check mode based on Path metadata
-        is_local_mode = (self.search_df.iloc[0]['Path'] == -1)
+        is_local_mode = self._is_local_mode()
 
         if is_local_mode:
-            print(f"[Download] Local Mode: Verifying files in '{target_dir}'...")
+            self._log(f"[Download] Local Mode: Verifying files in '{target_dir}'...")
+            snapshot = self._snapshot_dir(target_dir)
             final_list = []
             for idx in to_dl:
                 fname = self.search_df.loc[idx, 'Scene ID']
                 if not fname.endswith('.zip'): fname += '.zip'
                 
-                fpath = target_dir / fname
-                if fpath.exists():
+                if fname in snapshot:
                     final_list.append(fname)
                 else:
-                    print(f"[Error] Missing local file: {fname}")
+                    self._log(f"[Error] Missing local file: {fname}")
             self.downloaded_files = final_list
             return final_list
 
-        # API Mode (Sequential Download)
+        # API Mode (Parallel Download)
         if not self.authenticate(): return []
         os.makedirs(target_dir, exist_ok=True)
-        session = self.get_session()
+        session = self.get_session() # Shared: each worker uses its own Response
+        if verify: self.verify_existing(target_dir, to_dl, check_crc=check_crc)  # Damaged zips are removed -> re-downloaded
+        snapshot = self._snapshot_dir(target_dir)
         
-        target_scenes = [self.results[i] for i in sorted(list(to_dl))]
-        print(f"\n[Download] Starting Sequential Download ({len(target_scenes)} files) to {target_dir}...")
-        
-        downloaded = []
-        for idx, scene in enumerate(target_scenes):
-            url = scene.properties['url']
-            filename = scene.properties['fileName']
-            file_path = target_dir / filename
-            step = f"[{idx+1}/{len(target_scenes)}]"
+        target_scenes = [self.results[i] for i in sorted(to_dl)]
+        n_workers = max(1, min(max_workers, len(target_scenes)))
+        self._log(f"\n[Download] Starting Parallel Download ({len(target_scenes)} files, {n_workers} workers) to {target_dir}...")
+
+        # Progress bar rows 1..n are handed out to the workers (row 0 is the overall bar)
+        slots = queue.SimpleQueue()
+        for pos in range(1, n_workers + 1): slots.put(pos)
+
+        def task(idx, scene):
+            pos = slots.get()
+            try:
+                return self._download_one(scene, target_dir, session, f"[{idx+1}/{len(target_scenes)}]",
+                                          position=pos, n_parts=n_parts,
+                                          existing_size=snapshot.get(scene.properties['fileName']))
+            finally:
+                slots.put(pos)
+
+        ok_files = set()
+        with ThreadPoolExecutor(max_workers=n_workers) as executor, \
+             tqdm(total=len(target_scenes), unit='file', ncols=80, ascii=True, desc="Files", position=0) as overall:
+            futures = [executor.submit(task, i, scene) for i, scene in enumerate(target_scenes)]
+            for future in as_completed(futures):
+                filename, ok = future.result()
+                if ok: ok_files.add(filename)
+                overall.update(1)
+
+        downloaded = [s.properties['fileName'] for s in target_scenes if s.properties['fileName'] in ok_files]
+        self.downloaded_files = downloaded
+        return downloaded
+
+    async def download_selected_async(self, download_dir=None, max_concurrent=2, verify=True, check_crc=False):
+        """
+        Concurrent version of 'download_selected()' for use inside an asyncio event loop.
+
+        Each scene is downloaded by a 'download_one' coroutine that runs the blocking
+        HTTP transfer in a thread pool. An asyncio.Semaphore bounds the number of
+        simultaneous transfers, since ASF allows only ~2 concurrent flows per user.
+
+        Args:
+            download_dir (str, optional): Directory path to save/check files.
+                                          If None, uses self.data_dir.
+            max_concurrent (int): Maximum number of simultaneous downloads. Defaults to 2.
+            verify (bool): Check existing zips with 'verify_existing()' first. Defaults to True.
+            check_crc (bool): Also CRC-check existing zips (reads every byte). Defaults to False.
+
+        Returns:
+            list: List of valid filenames found or downloaded.
+        """
+        target_dir = Path(download_dir) if download_dir else self.data_dir
+
+        to_dl = self._all_indices
+
+        # Local Mode, VRT staging and empty selections reuse the blocking path in a worker
+        # thread, so the event loop keeps running the other tasks (orbits, DEM) meanwhile
+        if self.stage_mode == "vrt" or not to_dl or self._is_local_mode():
+            return await asyncio.to_thread(self.download_selected, download_dir, verify=verify, check_crc=check_crc)
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=4)
+        try:
+            if not await loop.run_in_executor(executor, self.authenticate): return []
+            os.makedirs(target_dir, exist_ok=True)
+            session = self.get_session()
+            if verify: await loop.run_in_executor(executor, functools.partial(
+                self.verify_existing, target_dir, to_dl, check_crc=check_crc))
+            snapshot = self._snapshot_dir(target_dir)
+
+            target_scenes = [self.results[i] for i in sorted(to_dl)]
+            self._log(f"\n[Download] Starting Concurrent Download ({len(target_scenes)} files, "
+                      f"max {max_concurrent} at once) to {target_dir}...")
+
+            semaphore = asyncio.Semaphore(max_concurrent)
+
+            async def download_one(idx, scene):
+                step = f"[{idx+1}/{len(target_scenes)}]"
+                async with semaphore:
+                    filename, ok = await loop.run_in_executor(
+                        executor, functools.partial(self._download_one, scene, target_dir, session, step,
+                                                    existing_size=snapshot.get(scene.properties['fileName']))
+                    )
+                return filename if ok else None
+
+            results = await asyncio.gather(*(download_one(i, s) for i, s in enumerate(target_scenes)))
+        finally:
+            executor.shutdown(wait=False)
+
+        downloaded = [fname for fname in results if fname]
+        self.downloaded_files = downloaded
+        return downloaded
+
+    def _download_one(self, scene, target_dir, session, step="", position=None, n_parts=1, max_retries=3,
+                      existing_size=None):
+        """
+        Downloads a single scene, retrying with exponential backoff on HTTP 503.
+
+        ASF replies '503 Maximum number of 2 concurrent flows' when too many streams
+        are open for one user, so those responses are retried instead of failing.
+
+        Args:
+            scene: ASF search result (or MockResult) with 'url' and 'fileName' properties.
+            target_dir (Path): Directory to save the file.
+            session (requests.Session): Authenticated session.
+            step (str): Progress prefix for log messages (e.g., '[1/3]').
+            position (int, optional): tqdm row for this stream when running in parallel.
+            n_parts (int): Parallel Range segments for the file (see '_download_ranged'). Defaults to 1.
+            max_retries (int): Number of retries on HTTP 503. Defaults to 3.
+            existing_size (int, optional): Size of the file already on disk (from '_snapshot_dir'),
+                                           or None if it does not exist.
 
-            if file_path.exists():
-                print(f"{step} Found existing file: {filename}")
-                downloaded.append(filename)
-                continue
+        Returns:
+            tuple: (filename, ok) where ok is True if the file is available locally.
+        """
+        url = scene.properties['url']
+        filename = scene.properties['fileName']
+        file_path = target_dir / filename
 
-            print(f"{step} Downloading: {filename}")
+        if existing_size is not None:
+            # ASF reports the product size; a mismatch means an interrupted earlier download
+            expected = scene.properties.get('bytes')
+            if not expected or int(expected) == existing_size:
+                self._log(f"{step} Found existing file: {filename}")
+                return filename, True
+            self._log(f"{step} [Warning] Partial file ({existing_size}/{int(expected)} bytes), re-downloading: {filename}")
+            os.remove(file_path)
+
+        self._log(f"{step} Downloading: {filename}")
+        for attempt in range(max_retries + 1):
             try:
+                # Segmented download first; None means the server does not support ranges
+                if n_parts > 1 and self._download_ranged(scene, file_path, session, n_parts,
+                                                         position=position, desc=f"   {step}"):
+                    self._log(f"   Complete: {filename}\n")
+                    return filename, True
+
                 with session.get(url, stream=True) as response:
                     response.raise_for_status()
                     total = int(response.headers.get('content-length', 0))
                     # tqdm: ascii=True for Jupyter compatibility
-                    with tqdm(total=total, unit='B', unit_scale=True, unit_divisor=1024, ncols=80, ascii=True, desc="   Progress") as pbar:
+                    with tqdm(total=total, unit='B', unit_scale=True, unit_divisor=1024, ncols=80, ascii=True,
+                              desc=f"   {step}", position=position, leave=position is None) as pbar:
+                        # C-level copy loop with a reused 1 MiB buffer; tqdm counts each read
+                        response.raw.decode_content = True
                         with open(file_path, 'wb') as f:
-                            for chunk in response.iter_content(5*1024*1024):
-                                if chunk:
-                                    size = f.write(chunk)
-                                    pbar.update(size)
-                downloaded.append(filename)
-                print("   Complete.\n")
+                            shutil.copyfileobj(CallbackIOWrapper(pbar.update, response.raw, 'read'), f, length=1024*1024)
+                self._log(f"   Complete: {filename}\n")
+                return filename, True
             except Exception as e:
-                print(f"   Failed: {e}\n")
                 if file_path.exists(): os.remove(file_path)
+                status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+                if status_code == 503 and attempt < max_retries:
+                    wait = 2 ** (attempt + 1)
+                    self._log(f"   [Retry] Server busy (503) for {filename}. Retrying in {wait}s...")
+                    time.sleep(wait)
+                    continue
+                self._log(f"   [Error] Failed: {e}\n")
+                return filename, False
+        return filename, False
 
-        self.downloaded_files = downloaded
-        return downloaded
+    def verify_existing(self, target_dir=None, indices=None, max_workers=4, check_crc=False):
+        """
+        Verifies already-downloaded zips in parallel and removes damaged ones.
+
+        Each file is size-checked against the ASF product size ('bytes'). With 'check_crc',
+        files of the right size also get the full CRC check (ZipFile.testzip), which reads
+        every byte of multi-GB zips, so it is opt-in. The checks are I/O-bound, so they
+        overlap in a thread pool.
+
+        Args:
+            target_dir (str, optional): Directory holding the zips. If None, uses self.data_dir.
+            indices (iterable, optional): Scene indices to check. Defaults to Master + selection.
+            max_workers (int): Number of files verified in parallel. Defaults to 4.
+            check_crc (bool): Also run ZipFile.testzip on size-matching files. Defaults to False.
+
+        Returns:
+            dict: {filename: 'ok' | 'missing' | 'truncated' | 'corrupt'}. Truncated and
+                  corrupt files are deleted so the next download fetches them again.
+        """
+        target_dir = Path(target_dir) if target_dir else self.data_dir
+        if indices is None:
+            indices = self._all_indices
+        snapshot = self._snapshot_dir(target_dir)
+        jobs = [(self.results[i].properties['fileName'], self.results[i].properties.get('bytes'))
+                for i in sorted(indices)]
+
+        def verify_one(job):
+            fname, expected = job
+            size = snapshot.get(fname)
+            if size is None: return 'missing'
+            if expected and int(expected) != size: return 'truncated'
+            if not check_crc: return 'ok'
+            try:
+                with zipfile.ZipFile(target_dir / fname) as zf:
+                    return 'ok' if zf.testzip() is None else 'corrupt'
+            except (zipfile.BadZipFile, OSError):
+                return 'corrupt'
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as ex:
+            statuses = dict(zip((fname for fname, _ in jobs), ex.map(verify_one, jobs)))
+
+        damaged = [f for f, st in statuses.items() if st in ('truncated', 'corrupt')]
+        for fname in damaged:
+            self._log(f"[Verify] Removing {statuses[fname]} file: {fname}")
+            (target_dir / fname).unlink(missing_ok=True)
+        n_ok = sum(st == 'ok' for st in statuses.values())
+        self._log(f"[Verify] {n_ok} ok, {len(damaged)} damaged, {len(statuses) - n_ok - len(damaged)} missing.")
+        return statuses
+
+    @staticmethod
+    def _snapshot_dir(target_dir):
+        """Returns {name: size} for all zips in a directory from a single scandir pass."""
+        if not os.path.isdir(target_dir): return {}
+        with os.scandir(target_dir) as it:
+            return {e.name: e.stat().st_size for e in it if e.name.endswith('.zip') and e.is_file()}
+
+    def _download_ranged(self, scene, file_path, session, n_parts=4, chunk=8*1024*1024, position=None, desc=""):
+        """
+        Downloads one file as N parallel HTTP Range segments written in place.
+
+        A HEAD request reads 'Content-Length' and checks 'Accept-Ranges: bytes'. The file is
+        pre-allocated, and each segment is streamed by its own worker into its byte range
+        with os.pwrite, so several TCP streams share the transfer of one large zip.
+
+        Args:
+            scene: ASF search result with 'url' property.
+            file_path (Path): Destination file.
+            session (requests.Session): Authenticated session.
+            n_parts (int): Number of parallel segments. Defaults to 4.
+            chunk (int): Read size per iteration in bytes. Defaults to 8 MB.
+            position (int, optional): tqdm row for the shared progress bar.
+            desc (str): Progress bar label.
+
+        Returns:
+            bool or None: True on success, None if ranged download is unsupported or the
+                          HEAD probe fails (caller falls back to a single stream).
+                          Segment errors are raised.
+        """
+        if not hasattr(os, 'pwrite'): return None
+
+        # Some redirect hops reject HEAD (403/405) while GET still works
+        try:
+            head = session.head(scene.properties['url'], allow_redirects=True)
+        except Exception:
+            return None
+        if not head.ok: return None
+        total = int(head.headers.get('content-length', 0))
+        if head.headers.get('accept-ranges', '').lower() != 'bytes' or total <= 0:
+            return None
+
+        url = head.url # Final (redirected) URL, avoids re-authenticating every segment
+        part = -(-total // n_parts)
+        ranges = [(start, min(start + part, total) - 1) for start in range(0, total, part)]
+        lock = threading.Lock()
+
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'): os.posix_fallocate(fd, 0, total)
+            else: os.ftruncate(fd, total)
+
+            with tqdm(total=total, unit='B', unit_scale=True, unit_divisor=1024, ncols=80, ascii=True,
+                      desc=desc, position=position, leave=position is None) as pbar:
+
+                def fetch(start, end):
+                    headers = {'Range': f'bytes={start}-{end}'}
+                    with session.get(url, headers=headers, stream=True) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise IOError("Server ignored the Range request")
+                        offset = start
+                        for buf in response.iter_content(chunk):
+                            view = memoryview(buf)
+                            while view:
+                                written = os.pwrite(fd, view, offset)
+                                view, offset = view[written:], offset + written
+                            with lock: pbar.update(len(buf))
+                    if offset != end + 1:
+                        raise IOError(f"Incomplete segment {start}-{end}")
+
+                with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                    for future in [executor.submit(fetch, a, b) for a, b in ranges]:
+                        future.result()
+        finally:
+            os.close(fd)
+        return True
+
+    # --------------------------------------------------------------------------
+    # 4-1. Burst Staging (VRT Mode)
+    # --------------------------------------------------------------------------
+    def stage_burst_vrts(self, roi_wkt=None, download_dir=None):
+        """
+        Stage selected scenes as lightweight SAFE directories backed by remote VRTs.
+
+        Instead of downloading the full SAFE zip (~4-8 GB), only 'manifest.safe' and the
+        annotation XMLs are fetched through GDAL's '/vsizip//vsicurl/' range requests.
+        Burst footprints are parsed from the annotation geolocation grid, and for each
+        swath/polarization with at least one burst intersecting the ROI, a VRT pointing
+        at the remote measurement TIFF is written under the original '.tiff' name
+        (GDAL identifies VRTs by content). Pixel data is then streamed on demand when
+        ISCE reads the bursts it needs.
+
+        Args:
+            roi_wkt (str, optional): ROI WKT used to select bursts. If None, uses self.roi.
+            download_dir (str, optional): Directory where staged SAFE folders are written.
+                                          If None, uses self.data_dir.
+
+        Returns:
+            dict: Mapping of staged SAFE names to lists of VRT paths.
+        """
+        import shapely.wkt
+        from osgeo import gdal
+
+        roi = roi_wkt if roi_wkt else self.roi
+        if roi is None:
+            self._log("[Error] VRT staging requires an ROI (roi_wkt).")
+            return {}
+        roi_geom = shapely.wkt.loads(roi)
+
+        target_dir = Path(download_dir) if download_dir else self.data_dir
+
+        to_dl = self._all_indices
+
+        if not to_dl:
+            self._log("[Error] Nothing to stage.")
+            return {}
+
+        if self._is_local_mode():
+            self._log("[Error] VRT staging requires API search results (no remote URL in Local Mode).")
+            return {}
+
+        if not self.authenticate(): return {}
+        os.makedirs(target_dir, exist_ok=True)
+        self._configure_vsicurl(target_dir)
+
+        target_scenes = [self.results[i] for i in sorted(to_dl)]
+        self._log(f"\n[Stage] Staging ROI bursts as VRTs ({len(target_scenes)} scenes) to {target_dir}...")
+
+        for idx, scene in enumerate(target_scenes):
+            safe_name = self._safe_name(scene)
+            remote_safe = f"/vsizip//vsicurl/{scene.properties['url']}/{safe_name}"
+            local_safe = target_dir / safe_name
+            step = f"[{idx+1}/{len(target_scenes)}]"
+            self._log(f"{step} Staging: {safe_name}")
+
+            try:
+                self._fetch_remote_file(gdal, f"{remote_safe}/manifest.safe", local_safe / "manifest.safe")
+
+                vrt_paths = []
+                for ann in sorted(gdal.ReadDir(f"{remote_safe}/annotation") or []):
+                    if not ann.endswith('.xml'): continue
+
+                    local_ann = local_safe / "annotation" / ann
+                    self._fetch_remote_file(gdal, f"{remote_safe}/annotation/{ann}", local_ann)
+
+                    footprints = self._parse_burst_footprints(local_ann)
+                    hits = [i for i, fp in enumerate(footprints) if fp is not None and fp.intersects(roi_geom)]
+                    if not hits: continue
+
+                    tiff_name = ann[:-4] + ".tiff"
+                    vrt_path = local_safe / "measurement" / tiff_name
+                    vrt_path.parent.mkdir(parents=True, exist_ok=True)
+                    gdal.Translate(str(vrt_path), f"{remote_safe}/measurement/{tiff_name}", format="VRT")
+                    vrt_paths.append(str(vrt_path))
+                    self._log(f"   {tiff_name}: bursts {hits} intersect ROI")
+
+                if not vrt_paths:
+                    self._log("   [Warning] No burst intersects the ROI.")
+                self.staged_vrts[safe_name] = vrt_paths
+            except Exception as e:
+                self._log(f"   [Error] Failed: {e}\n")
+
+        self.downloaded_files = list(self.staged_vrts)
+        return self.staged_vrts
+
+    @staticmethod
+    def _safe_name(scene):
+        """Returns the SAFE directory name inside a scene's zip archive."""
+        return Path(scene.properties['fileName']).stem + ".SAFE"
+
+    @staticmethod
+    def _configure_vsicurl(target_dir):
+        """
+        Sets GDAL '/vsicurl/' options for authenticated ASF range requests.
+        Uses environment variables so the ISCE subprocess inherits them too.
+        """
+        cookie_jar = str(Path(target_dir).resolve() / ".gdal_cookies.txt")
+        os.environ["GDAL_HTTP_COOKIEFILE"] = cookie_jar
+        os.environ["GDAL_HTTP_COOKIEJAR"] = cookie_jar
+        os.environ["GDAL_HTTP_NETRC"] = "YES"
+        os.environ["CPL_VSIL_CURL_USE_HEAD"] = "YES"
+        os.environ.setdefault("GDAL_DISABLE_READDIR_ON_OPEN", "EMPTY_DIR")
+
+    @staticmethod
+    def _fetch_remote_file(gdal, src, dst):
+        """Copies a single file from a GDAL virtual path to local disk (skips existing)."""
+        dst = Path(dst)
+        if dst.exists() and dst.stat().st_size > 0: return
+
+        f = gdal.VSIFOpenL(src, 'rb')
+        if f is None:
+            raise IOError(f"Cannot open remote file: {src}")
+        try:
+            gdal.VSIFSeekL(f, 0, 2)
+            size = gdal.VSIFTellL(f)
+            gdal.VSIFSeekL(f, 0, 0)
+            data = gdal.VSIFReadL(1, size, f)
+        finally:
+            gdal.VSIFCloseL(f)
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(data)
+
+    @staticmethod
+    def _parse_burst_footprints(annotation_path):
+        """
+        Parses approximate burst footprints from a Sentinel-1 annotation XML.
+
+        The geolocation grid is sampled on lines near burst boundaries, so each burst
+        collects grid points within half a burst of its line range (conservative bbox).
+
+        Returns:
+            list: One shapely box per burst (None if no grid points fall in range).
+        """
+        import xml.etree.ElementTree as XET
+        from shapely.geometry import box
+
+        root = XET.parse(annotation_path).getroot()
+        lines_per_burst = int(root.findtext('.//swathTiming/linesPerBurst'))
+        n_bursts = len(root.findall('.//swathTiming/burstList/burst'))
+
+        points = [
+            (int(pt.findtext('line')), float(pt.findtext('longitude')), float(pt.findtext('latitude')))
+            for pt in root.iterfind('.//geolocationGrid/geolocationGridPointList/geolocationGridPoint')
+        ]
+
+        margin = lines_per_burst // 2
+        footprints = []
+        for i in range(n_bursts):
+            first, last = i * lines_per_burst - margin, (i + 1) * lines_per_burst + margin
+            lons = [lon for line, lon, _ in points if first <= line <= last]
+            lats = [lat for line, _, lat in points if first <= line <= last]
+            footprints.append(box(min(lons), min(lats), max(lons), max(lats)) if lons else None)
+        return footprints
 
     # --------------------------------------------------------------------------
     # 5. Visualization
@@ -534,12 +1179,17 @@ class S1SLCManager(EarthdataAuth):
             interactive (bool): Use Plotly if True, Matplotlib if False.
         """
         # Use stack_df if exists, otherwise compatible_df (for B_temp only plots)
+        self._sync_baseline()
         source_df = self.stack_df if self.stack_df is not None else self.compatible_df
         
         if source_df is None or 'B_temp_days' not in source_df.columns:
-             print("[Warning] Master not set or Baselines not calculated.")
+             self._log("[Warning] Master not set or Baselines not calculated.")
              return
 
+        if source_df.empty or self.master_idx not in source_df.index:
+            self._log("[Warning] Master is not part of the current stack. Nothing to plot.")
+            return
+
         master_row = source_df.loc[self.master_idx]
         slaves = source_df.drop(self.master_idx)
         
@@ -552,19 +1202,21 @@ class S1SLCManager(EarthdataAuth):
         if interactive:
             fig = go.Figure()
             # Support colors for S1A, S1B, S1C
-            colors = slaves['Platform'].map(lambda x: {'S1A': 'royalblue', 'S1B': 'forestgreen', 'S1C': 'orange'}.get(x, 'gray'))
+            # Categorical map: remaps the few categories, not every row (unknown platforms -> gray)
+            colors = (slaves['Platform'].map({'S1A': 'royalblue', 'S1B': 'forestgreen', 'S1C': 'orange'})
+                      .astype(object).fillna('gray').to_numpy())
             
-            # Handle NaN B_perp in Local Mode
-            hover_txt = []
-            for i, r in slaves.iterrows():
-                bp_str = f"{r['B_perp_m']:.1f}m" if pd.notnull(r.get('B_perp_m')) else "N/A"
-                hover_txt.append(f"Idx: {i}<br>{r['Date'].date()}<br>B_perp: {bp_str}")
+            # Handle NaN B_perp in Local Mode (vectorized string columns)
+            bp = slaves['B_perp_m'] if 'B_perp_m' in slaves else pd.Series(np.nan, index=slaves.index)
+            bp_s = bp.map('{:.1f}m'.format).where(bp.notna(), 'N/A')
+            hover_txt = ('Idx: ' + slaves.index.astype(str).to_series(index=slaves.index) + '<br>'
+                         + slaves['Date'].dt.strftime('%Y-%m-%d') + '<br>B_perp: ' + bp_s).tolist()
 
-            # Plot Slaves
-            fig.add_trace(go.Scatter(
+            # Plot Slaves (WebGL: stays responsive for long stacks)
+            fig.add_trace(go.Scattergl(
                 x=slaves['Date'], y=slaves.get('B_perp_m', [0]*len(slaves)), 
                 mode='markers+text', marker=dict(size=10, color=colors),
-                text=[f"{int(d):+d}d" for d in slaves['B_temp_days']], 
+                text=slaves['B_temp_days'].astype(int).map('{:+d}d'.format).tolist(), 
                 textposition="top center", hovertext=hover_txt, hoverinfo="text", name="Slaves"
             ))
             # Plot Master
@@ -1,5 +1,7 @@
 import earthaccess
 import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 class EarthdataAuth:
     """
@@ -10,18 +12,22 @@ class EarthdataAuth:
         """Initialize the authentication handler."""
         self.username = os.environ.get("EARTHDATA_USERNAME")
         self.password = os.environ.get("EARTHDATA_PASSWORD")
+        self._authenticated = False
+        self._session = None
 
     def authenticate(self):
         """
-        Perform authentication with NASA Earthdata.
+        Perform authentication with NASA Earthdata (only once per instance).
         Returns:
             bool: True if authentication is successful, False otherwise.
         """
+        if self._authenticated: return True
         print("[Auth] Initializing NASA Earthdata Authentication...")
         try:
             auth = earthaccess.login(strategy="interactive", persist=True)
             if auth.authenticated:
                 print(f" [Auth] Logged in successfully.")
+                self._authenticated = True
                 return True
             return False
         except Exception as e:
@@ -32,5 +38,20 @@ class EarthdataAuth:
         """
         Returns an authenticated requests session.
         Inheriting classes can use this without importing 'earthaccess'.
+
+        The session is created once and reused, so keep-alive connections (and their
+        TLS handshakes) are shared across files. Transient server errors are retried
+        with backoff, except 503: ASF uses it for its per-user flow limit, and callers
+        (e.g. '_download_one') retry it themselves, so retries do not multiply.
         """
-        return earthaccess.get_requests_https_session()
\ No newline at end of file
+        if self._session is None:
+            session = earthaccess.get_requests_https_session()
+            retry = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 504],
+                          raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # SAFE zips are already compressed; identity keeps Content-Length exact
+            session.headers.update({"Accept-Encoding": "identity"})
+            self._session = session
+        return self._session
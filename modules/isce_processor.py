@@ -1,14 +1,16 @@
 import os
+import re
 import sys
 import shutil
+import stat
+import select
 import subprocess
+import time
 import logging
-import lxml.etree as ET
-import pandas as pd
-import rasterio
 from pathlib import Path
-from shapely.geometry import box
-from shapely.wkt import loads as load_wkt
+
+# lxml, pandas, rasterio (GDAL) and shapely are imported inside the methods that
+# use them, so importing ISCEProcessor for 'run_process' alone stays cheap.
 
 class ISCEProcessor:
     """
@@ -24,6 +26,24 @@ class ISCEProcessor:
         logger (logging.Logger): Logger instance for capturing execution details.
     """
 
+    # ISCE install locations, resolved once per process
+    _ISCE_APPS = None
+    _TOPSAPP = None
+
+    # Explicit geocode list, pre-rendered in the Python-list syntax topsApp parses
+    _GEOCODE_LIST_STR = "[" + ", ".join(f"'{f}'" for f in (
+        'merged/phsig.cor', 'merged/filt_topophase.unw', 'merged/los.rdr',
+        'merged/topophase.flat', 'merged/filt_topophase.flat',
+        'merged/topophase.cor', 'merged/z.rdr',
+        'merged/lat.rdr', 'merged/lon.rdr'
+    )) + "]"
+
+    # topsApp.xml skeleton (serialized once) and precompiled lookups into it,
+    # both built on first use by '_xml_template()'
+    _XML_TEMPLATE = None
+    _COMPONENT_XPATH = None
+    _PROPERTY_XPATH = None
+
     def __init__(self, work_dir="process_insar", raw_data_dir=None, dem_path=None):
         """
         Initializes the ISCEProcessor with workspace paths and logging configuration.
@@ -83,11 +103,8 @@ class ISCEProcessor:
 
         # 3. Fix Tool Collisions (The Real Fix)
         # We must look inside the site-packages, NOT the bin directory.
-        try:
-            import isce
-            isce_pkg_dir = Path(os.path.dirname(isce.__file__))
-            isce_apps_dir = isce_pkg_dir / "applications" # Source of truth
-        except ImportError:
+        isce_apps_dir = self._isce_apps_dir() # Source of truth
+        if isce_apps_dir is None:
             self.logger.error("❌ ISCE package not found. Is it installed?")
             return
 
@@ -133,22 +150,27 @@ class ISCEProcessor:
         
         # Helper: Robust Path Resolver
         def resolve_real_path(input_path_str):
-            path = Path(input_path_str)
-            if path.exists(): return path.resolve()
+            path = Path(os.fspath(input_path_str))
+            # Common case: the path is correct -> a single stat via resolve(strict=True)
+            try: return path.resolve(strict=True)
+            except FileNotFoundError: pass
             
-            # Heuristic 1: Remove "-SLC" suffix
+            # Heuristic 1: Remove "-SLC" suffix / Heuristic 2: Add "-SLC" suffix
             if "-SLC.zip" in path.name:
-                new_path = path.with_name(path.name.replace("-SLC.zip", ".zip"))
-                if new_path.exists(): 
-                    self.logger.warning(f"⚠️ [Auto-Fix] Filename mismatch: {path.name} -> {new_path.name}")
-                    return new_path.resolve()
-            
-            # Heuristic 2: Add "-SLC" suffix
-            if not "-SLC.zip" in path.name and path.suffix == ".zip":
-                new_path = path.with_name(path.stem + "-SLC.zip")
-                if new_path.exists(): 
-                    self.logger.warning(f"⚠️ [Auto-Fix] Filename mismatch (Added -SLC): {path.name} -> {new_path.name}")
-                    return new_path.resolve()
+                new_name, msg = path.name.replace("-SLC.zip", ".zip"), "Filename mismatch"
+            elif path.suffix == ".zip":
+                new_name, msg = path.stem + "-SLC.zip", "Filename mismatch (Added -SLC)"
+            else:
+                new_name = None
+
+            if new_name:
+                new_path = path.with_name(new_name)
+                try:
+                    resolved = new_path.resolve(strict=True)
+                    self.logger.warning(f"⚠️ [Auto-Fix] {msg}: {path.name} -> {new_path.name}")
+                    return resolved
+                except FileNotFoundError:
+                    pass
 
             self.logger.error(f"❌ File not found: {path}")
             return path 
@@ -157,55 +179,49 @@ class ISCEProcessor:
         master_path = resolve_real_path(slc_status['pairs'][0][0])
         slave_path = resolve_real_path(slc_status['pairs'][0][1])
 
-        self._create_symlink(master_path, self.work_dir / master_path.name)
-        self._create_symlink(slave_path, self.work_dir / slave_path.name)
+        self._create_symlink(master_path, self.work_dir / master_path.name, hardlink=True)
+        self._create_symlink(slave_path, self.work_dir / slave_path.name, hardlink=True)
 
+        # DEM may be the raw ISCE binary ('dem.wgs84') or a GDAL VRT ('dem.vrt')
         dem_src = Path(dem_status['dem_path'])
-        self._create_symlink(dem_src, self.work_dir / "dem.wgs84")
+        dem_name = dem_src.name
+        self._create_symlink(dem_src, self.work_dir / dem_name)
         
         # Link DEM XML if it exists
-        dem_xml_src = dem_src.with_suffix(".wgs84.xml")
-        if dem_xml_src.exists():
-            self._create_symlink(dem_xml_src, self.work_dir / "dem.wgs84.xml")
+        dem_xml_src = dem_src.with_name(dem_name + ".xml")
+        try:
+            os.stat(dem_xml_src)
+            self._create_symlink(dem_xml_src, self.work_dir / dem_xml_src.name)
+        except FileNotFoundError:
+            pass
 
         # 2. ROI
-        final_bbox = self._calculate_roi_bounds(self.work_dir / "dem.wgs84", roi_wkt, slc_bbox)
-
-        # 3. Build XML Structure
-        root = ET.Element("topsApp")
-        topsinsar = ET.SubElement(root, "component", name="topsinsar")
+        final_bbox = self._calculate_roi_bounds(self.work_dir / dem_name, roi_wkt, slc_bbox)
 
-        # Configure Components (Reference/Secondary)
+        # 3. Fill the cached XML skeleton (only the per-pair values change)
+        root = self._xml_template()
+        topsinsar = root[0]
         for comp_name, path in [("reference", master_path), ("secondary", slave_path)]:
-            comp = ET.SubElement(topsinsar, "component", name=comp_name)
-            self._add_property(comp, "safe", f"['{str(path.resolve())}']")
-            self._add_property(comp, "output directory", comp_name)
-            self._add_property(comp, "orbit directory", orbit_status['orbit_dir'])
-            self._add_property(comp, "auxiliary data directory", orbit_status['aux_dir'])
-
-        # Global Properties
-        self._add_property(topsinsar, "dem filename", "dem.wgs84")
-        
-        if final_bbox:
-            self._add_property(topsinsar, "region of interest", str(final_bbox))
-
-        self._add_property(topsinsar, "swaths", "[1, 2, 3]")
-        self._add_property(topsinsar, "do unwrap", "True")
-        self._add_property(topsinsar, "unwrapper name", unwrapper)
-        
-        if use_gpu:
-            self._add_property(topsinsar, "useGPU", "True")
-
-        # Explicit Geocode List
-        geocode_files = [
-            'merged/phsig.cor', 'merged/filt_topophase.unw', 'merged/los.rdr', 
-            'merged/topophase.flat', 'merged/filt_topophase.flat', 
-            'merged/topophase.cor', 'merged/z.rdr',
-            'merged/lat.rdr', 'merged/lon.rdr'
-        ]
-        self._add_property(topsinsar, "geocode list", str(geocode_files))
+            comp = self._COMPONENT_XPATH(topsinsar, name=comp_name)[0]
+            self._set_property(comp, "safe", f"['{str(path.resolve())}']")
+            self._set_property(comp, "orbit directory", orbit_status['orbit_dir'])
+            self._set_property(comp, "auxiliary data directory", orbit_status['aux_dir'])
+
+        # VRT staging only writes the swaths whose bursts hit the ROI; ask topsApp for those alone
+        swaths = self._staged_swaths(slc_status, (master_path.name, slave_path.name))
+        if swaths:
+            self._set_property(topsinsar, "swaths", str(swaths))
+        elif swaths is not None:
+            self.logger.error("❌ Master and Slave share no staged swath. Re-stage with a wider ROI.")
+
+        self._set_property(topsinsar, "dem filename", dem_name)
+        self._set_property(topsinsar, "region of interest", str(final_bbox) if final_bbox else None)
+        self._set_property(topsinsar, "unwrapper name", unwrapper)
+        if not use_gpu:
+            self._set_property(topsinsar, "useGPU", None)
 
         # Write XML file
+        import lxml.etree as ET
         tree = ET.ElementTree(root)
         with open(self.xml_path, "wb") as f:
             tree.write(f, pretty_print=True, xml_declaration=True, encoding='utf-8')
@@ -220,19 +236,7 @@ class ISCEProcessor:
             start_step (str, optional): The ISCE step to start from (e.g., 'unwrap').
             end_step (str, optional): The ISCE step to end at.
         """
-        target_script = None
-        
-        # Priority 1: ISCE Package
-        try:
-            import isce
-            candidate = Path(os.path.dirname(isce.__file__)) / "applications" / "topsApp.py"
-            if candidate.exists(): target_script = str(candidate)
-        except ImportError: pass
-
-        # Priority 2: Conda Bin
-        if not target_script:
-            candidate = Path(sys.prefix) / "bin" / "topsApp.py"
-            if candidate.exists(): target_script = str(candidate)
+        target_script = self._topsapp_path()
 
         if not target_script:
             self.logger.error("❌ Could not find topsApp.py. Please check ISCE installation.")
@@ -255,9 +259,9 @@ class ISCEProcessor:
         try:
             env = os.environ.copy()
             
-            # Open the log file in append mode
-            with open(log_file_path, "a", encoding="utf-8") as log_f:
-                log_f.write(f"\n\n{'='*20}\nEXECUTION START: {' '.join(command)}\n{'='*20}\n")
+            # Open the log file in binary append mode (raw bytes are written as-is)
+            with open(log_file_path, "ab") as log_f:
+                log_f.write(f"\n\n{'='*20}\nEXECUTION START: {' '.join(command)}\n{'='*20}\n".encode())
                 
                 process = subprocess.Popen(
                     command,
@@ -265,25 +269,42 @@ class ISCEProcessor:
                     env=env,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT, # Merge stderr into stdout
-                    text=True,
-                    bufsize=1 # Line-buffered for real-time output
+                    bufsize=0 # Unbuffered binary pipe
                 )
                 
-                # Real-time streaming
-                for line in process.stdout:
-                    stripped_line = line.strip()
-                    print(f"  | {stripped_line}")  # To Jupyter Console
-                    log_f.write(f"{stripped_line}\n") # To Log File
-                    log_f.flush() # Force write to disk immediately
+                # Real-time streaming: read whatever the child flushed, tee it
+                fd = process.stdout.fileno()
+                pending = b""
+                last_flush = time.monotonic()
+                while True:
+                    ready, _, _ = select.select([fd], [], [], 1.0)
+                    if time.monotonic() - last_flush > 1.0:
+                        log_f.flush() # Periodic flush: the log stays readable while ISCE runs
+                        last_flush = time.monotonic()
+                    if not ready: continue
+                    chunk = os.read(fd, 65536)
+                    if not chunk: break # EOF: child closed its output
+                    log_f.write(chunk) # To Log File
+
+                    # To Jupyter Console: complete lines only, decoded for display
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    if lines:
+                        print("\n".join(f"  | {l.decode('utf-8', 'replace').strip()}" for l in lines))
+                if pending:
+                    print(f"  | {pending.decode('utf-8', 'replace').strip()}")
                 
                 process.wait()
                 
                 if process.returncode == 0:
                     self.logger.info("✅ Step completed.")
-                    log_f.write("\n[SUCCESS] Step completed.\n")
+                    log_f.write(b"\n[SUCCESS] Step completed.\n")
                 else:
                     self.logger.error(f"❌ Failed (Code {process.returncode}).")
-                    log_f.write(f"\n[FAILURE] Process exited with code {process.returncode}.\n")
+                    log_f.write(f"\n[FAILURE] Process exited with code {process.returncode}.\n".encode())
+
+                # Durable on exit: one flush + fsync instead of a flush per line
+                log_f.flush()
+                os.fsync(log_f.fileno())
                     
         except Exception as e:
             self.logger.error(f"❌ Execution error: {e}")
@@ -303,6 +324,8 @@ class ISCEProcessor:
         Returns:
             pd.DataFrame or list: Collection of available output files.
         """
+        import pandas as pd
+
         merged_dir = self.work_dir / "merged"
         if not merged_dir.exists():
             self.logger.warning("⚠️ 'merged' directory not found. Process might not have finished.")
@@ -314,25 +337,30 @@ class ISCEProcessor:
             target_exts = [f"{ext}.geo" for ext in base_extensions]
         else:
             target_exts = base_extensions + [f"{ext}.geo" for ext in base_extensions]
+        target_exts = tuple(target_exts)  # str.endswith accepts a tuple (single C-level check)
 
-        found_files = []
-        for f in merged_dir.iterdir():
-            # Check if file ends with any target extension and ignore metadata files
-            if any(str(f).endswith(ext) for ext in target_exts) and f.suffix not in ['.xml', '.vrt']:
-                found_files.append({
-                    "Filename": f.name,
-                    "Type": "Geocoded" if ".geo" in f.name else "Radar Coords",
-                    "Size (MB)": round(f.stat().st_size / (1024 * 1024), 2),
-                    "Path": str(f)
-                })
+        names, paths, sizes = [], [], []
+        with os.scandir(merged_dir) as it:
+            for entry in it:
+                # Check if file ends with any target extension and ignore metadata files
+                if entry.name.endswith(target_exts) and not entry.name.endswith(('.xml', '.vrt')):
+                    names.append(entry.name)
+                    paths.append(entry.path)
+                    if as_df: sizes.append(entry.stat().st_size)
 
         if as_df:
-            df = pd.DataFrame(found_files)
+            # Built column-wise (no per-row dicts)
+            df = pd.DataFrame({
+                "Filename": names,
+                "Type": ["Geocoded" if ".geo" in n else "Radar Coords" for n in names],
+                "Size (MB)": [round(b / (1024 * 1024), 2) for b in sizes],
+                "Path": paths
+            })
             if not df.empty:
                 df = df.sort_values(by="Filename").reset_index(drop=True)
             return df
         else:
-            return [Path(f["Path"]) for f in found_files]
+            return [Path(p) for p in paths]
 
     def load_raster(self, filename):
         """
@@ -345,6 +373,8 @@ class ISCEProcessor:
         Returns:
             rasterio.io.DatasetReader: Open rasterio dataset handle.
         """
+        import rasterio
+
         target_path = self.work_dir / "merged" / filename
         
         # If specific file not found, try searching
@@ -387,26 +417,29 @@ class ISCEProcessor:
             list: Bounding box [S, N, W, E] of the intersection, or None.
         """
         try:
-            with rasterio.open(dem_path) as src:
-                dem_poly = box(*src.bounds)
+            dem_bbox = self._read_dem_bbox_fast(dem_path)
             
-            target_poly = None
             if roi_wkt:
                 self.logger.info("[ROI] Using user-provided WKT.")
+                from shapely.geometry import box
+                from shapely.wkt import loads as load_wkt
                 target_poly = load_wkt(roi_wkt)
+                # Envelope test first; Shapely only for overlapping, arbitrary polygons
+                b = self._bbox_intersect(target_poly.bounds, dem_bbox)
+                if b is not None:
+                    intersection = target_poly.intersection(box(*dem_bbox))
+                    b = None if intersection.is_empty else intersection.bounds
             elif slc_bbox:
                 self.logger.info("[ROI] Using SLC intersection bbox.")
-                target_poly = box(slc_bbox[2], slc_bbox[0], slc_bbox[3], slc_bbox[1])
+                # Both are rectangles: pure float overlap, no GEOS objects
+                b = self._bbox_intersect((slc_bbox[2], slc_bbox[0], slc_bbox[3], slc_bbox[1]), dem_bbox)
             else:
                 return None
 
-            intersection = target_poly.intersection(dem_poly)
-
-            if intersection.is_empty:
+            if b is None:
                 self.logger.warning("[ROI] ROI does not overlap with DEM! ROI set to None.")
                 return None
             
-            b = intersection.bounds 
             final_bbox = [b[1], b[3], b[0], b[2]]
             self.logger.info(f"[ROI] Intersection Calculated: {final_bbox}")
             return final_bbox
@@ -416,19 +449,195 @@ class ISCEProcessor:
             if slc_bbox: return slc_bbox
             return None
 
-    def _create_symlink(self, src_path, link_path):
-        """Creates a symbolic link safely, removing existing ones if necessary."""
+    @staticmethod
+    def _bbox_intersect(a, b):
+        """Intersects two (minx, miny, maxx, maxy) boxes; returns None if they are disjoint."""
+        if a[2] < b[0] or a[0] > b[2] or a[3] < b[1] or a[1] > b[3]:
+            return None
+        return (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+
+    @staticmethod
+    def _read_dem_bbox_fast(dem_path):
+        """
+        Reads the DEM bounds from its metadata without opening the raster.
+
+        Tries the ISCE header ('<dem>.xml', coordinate1/2 start/delta/size), then the
+        GDAL VRT itself (GeoTransform + raster size). Falls back to rasterio only if
+        neither sidecar is usable.
+
+        Args:
+            dem_path (Path): Path to the DEM file (e.g., 'dem.wgs84' or 'dem.vrt').
+
+        Returns:
+            tuple: (minx, miny, maxx, maxy) in degrees.
+        """
+        import lxml.etree as ET
+
+        dem_path = Path(dem_path)
+
+        def span(start, delta, size):
+            end = start + delta * size
+            return min(start, end), max(start, end)
+
+        # 1. ISCE XML header
+        isce_xml = dem_path.with_name(dem_path.name + ".xml")
+        if isce_xml.exists():
+            try:
+                root = ET.parse(str(isce_xml)).getroot()
+                coords = []
+                for name in ("coordinate1", "coordinate2"):
+                    comp = root.find(f"component[@name='{name}']")
+                    get = lambda key: float(comp.findtext(f"property[@name='{key}']/value"))
+                    coords.append(span(get("startingvalue"), get("delta"), get("size")))
+                (minx, maxx), (miny, maxy) = coords
+                return minx, miny, maxx, maxy
+            except (ET.XMLSyntaxError, AttributeError, TypeError, ValueError):
+                pass
+
+        # 2. GDAL VRT (GeoTransform = x0, dx, rx, y0, ry, dy)
+        if dem_path.suffix == ".vrt" and dem_path.exists():
+            try:
+                root = ET.parse(str(dem_path)).getroot()
+                x0, dx, _, y0, _, dy = (float(v) for v in root.findtext("GeoTransform").split(","))
+                minx, maxx = span(x0, dx, int(root.get("rasterXSize")))
+                miny, maxy = span(y0, dy, int(root.get("rasterYSize")))
+                return minx, miny, maxx, maxy
+            except (ET.XMLSyntaxError, AttributeError, TypeError, ValueError):
+                pass
+
+        # 3. Fallback: open the raster
+        import rasterio
+        with rasterio.open(dem_path) as src:
+            return tuple(src.bounds)
+
+    @staticmethod
+    def _staged_swaths(slc_status, safe_names):
+        """
+        Returns the sorted IW swath numbers staged as VRTs for every given SAFE.
+
+        Args:
+            slc_status (dict): Status dict from S1SLCManager ('stage_mode', 'vrt_files').
+            safe_names (iterable): Staged SAFE directory names (e.g., Master and Slave).
+
+        Returns:
+            list or None: e.g. [1, 2]; None outside VRT mode (all swaths are on disk).
+        """
+        if slc_status.get('stage_mode') != 'vrt': return None
+        vrt_files = slc_status.get('vrt_files') or {}
+        common = None
+        for name in safe_names:
+            # Measurement names look like 's1a-iw2-slc-vv-...tiff'
+            found = {int(m.group(1)) for f in vrt_files.get(name, [])
+                     if (m := re.search(r'-iw(\d)-', Path(f).name))}
+            common = found if common is None else common & found
+        return sorted(common or [])
+
+    def _create_symlink(self, src_path, link_path, hardlink=False):
+        """
+        Links a file into the work dir safely, removing existing links if necessary.
+
+        With 'hardlink' (immutable SLC zips only), regular files on the same device as the
+        work dir are hard-linked, so ISCE opens them without symlink traversal (extra
+        metadata RPCs on NFS/Lustre). Everything else is symlinked: directories (e.g.,
+        staged SAFE folders), cross-device files, and the DEM files, which a later export
+        may replace rather than rewrite (a hard link would keep the stale copy).
+
+        The link is created under a temporary name and swapped in with os.replace, so
+        an existing link is replaced atomically (no window where the name is missing).
+        """
         src = Path(src_path).resolve()
         lnk = Path(link_path)
-        if lnk.exists() or lnk.is_symlink():
-            lnk.unlink()
+        tmp = lnk.with_name(lnk.name + f".tmp.{os.getpid()}")
         try:
-            os.symlink(src, lnk)
+            if os.path.lexists(tmp): os.unlink(tmp) # Leftover from an interrupted run
+            linked = False
+            st_src = os.stat(src)
+            if hardlink and stat.S_ISREG(st_src.st_mode) and st_src.st_dev == os.stat(self.work_dir).st_dev:
+                try:
+                    os.link(src, tmp)
+                    linked = True
+                except OSError:
+                    pass # e.g., filesystem without hard link support -> symlink
+            if not linked:
+                os.symlink(src, tmp)
+            os.replace(tmp, lnk)
+            # rename() is a no-op if both names are hard links to the same file
+            if os.path.lexists(tmp): os.unlink(tmp)
         except OSError as e:
             self.logger.error(f"Failed to link {lnk.name}: {e}")
 
-    def _add_property(self, parent, name, value):
+    @classmethod
+    def _isce_apps_dir(cls):
+        """Returns (and caches) the 'applications' directory inside the isce package, or None."""
+        if cls._ISCE_APPS is None:
+            try:
+                import isce
+                cls._ISCE_APPS = Path(os.path.dirname(isce.__file__)) / "applications"
+            except ImportError:
+                return None
+        return cls._ISCE_APPS
+
+    @classmethod
+    def _topsapp_path(cls):
+        """Locates (and caches) 'topsApp.py': ISCE package first, then the Conda bin dir."""
+        if cls._TOPSAPP is None:
+            apps_dir = cls._isce_apps_dir()
+            candidates = [apps_dir / "topsApp.py"] if apps_dir else []
+            candidates.append(Path(sys.prefix) / "bin" / "topsApp.py")
+            cls._TOPSAPP = next((str(c) for c in candidates if c.exists()), None)
+        return cls._TOPSAPP
+
+    @classmethod
+    def _xml_template(cls):
+        """
+        Returns a fresh copy of the topsApp.xml skeleton.
+
+        The static structure (components, swaths, unwrap flags, geocode list) is built
+        once and kept serialized in '_XML_TEMPLATE'; each call only re-parses those bytes.
+        """
+        import lxml.etree as ET
+
+        if cls._XML_TEMPLATE is None:
+            cls._COMPONENT_XPATH = ET.XPath("component[@name=$name]")
+            cls._PROPERTY_XPATH = ET.XPath("property[@name=$name]")
+
+            root = ET.Element("topsApp")
+            topsinsar = ET.SubElement(root, "component", name="topsinsar")
+
+            # Configure Components (Reference/Secondary)
+            for comp_name in ("reference", "secondary"):
+                comp = ET.SubElement(topsinsar, "component", name=comp_name)
+                cls._add_property(comp, "safe", "")
+                cls._add_property(comp, "output directory", comp_name)
+                cls._add_property(comp, "orbit directory", "")
+                cls._add_property(comp, "auxiliary data directory", "")
+
+            # Global Properties (optional ones are removed by '_set_property(..., None)')
+            cls._add_property(topsinsar, "dem filename", "")
+            cls._add_property(topsinsar, "region of interest", "")
+            cls._add_property(topsinsar, "swaths", "[1, 2, 3]")
+            cls._add_property(topsinsar, "do unwrap", "True")
+            cls._add_property(topsinsar, "unwrapper name", "")
+            cls._add_property(topsinsar, "useGPU", "True")
+
+            # Explicit Geocode List
+            cls._add_property(topsinsar, "geocode list", cls._GEOCODE_LIST_STR)
+            cls._XML_TEMPLATE = ET.tostring(root)
+        return ET.fromstring(cls._XML_TEMPLATE)
+
+    @classmethod
+    def _set_property(cls, parent, name, value):
+        """Sets the value of a template property, or removes the property if value is None."""
+        prop = cls._PROPERTY_XPATH(parent, name=name)[0]
+        if value is None:
+            parent.remove(prop)
+        else:
+            prop[0].text = str(value)
+
+    @staticmethod
+    def _add_property(parent, name, value):
         """Helper to add a property element to the ISCE XML."""
+        import lxml.etree as ET
         prop = ET.SubElement(parent, "property", name=name)
         val = ET.SubElement(prop, "value")
         val.text = str(value)
\ No newline at end of file
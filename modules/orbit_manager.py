@@ -1,5 +1,7 @@
 import os
-import pandas as pd
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from modules.auth_base import EarthdataAuth
 
@@ -21,6 +23,11 @@ class OrbitManager(EarthdataAuth):
         orbit_dir (Path): The directory path where orbit files (.EOF) are stored.
     """
 
+    # S1A_IW_SLC__1SDV_20220101T060000_... -> (Mission, StartTimestamp)
+    _FN_RE = re.compile(r'^(S1[ABC])_[A-Z0-9]+_SLC__[^_]+_(\d{8}T\d{6})_')
+    # S1A_OPER_AUX_POEORB_OPOD_<created>_V<start>_<stop>.EOF -> (Mission, POE|RES, Start, Stop)
+    _EOF_RE = re.compile(r'^(S1[ABC])_OPER_AUX_(POE|RES)ORB_OPOD_\d{8}T\d{6}_V(\d{8}T\d{6})_(\d{8}T\d{6})\.EOF$')
+
     def __init__(self, orbit_dir="aux_orbits"):
         """
         Initializes the OrbitManager.
@@ -37,6 +44,10 @@ class OrbitManager(EarthdataAuth):
         self.orbit_dir = Path(orbit_dir)
         self.orbit_dir.mkdir(parents=True, exist_ok=True)
 
+        # Orbits resolved in this session: (mission, YYYYMMDD) for POE (one file covers a
+        # whole day), (mission, YYYYMMDDTHHMMSS) for RES. Values are orbit file paths.
+        self._orbit_cache = {}
+
 # --------------------------------------------------------------------------
     # 0. Interface for Loose Coupling (Fixed)
     # --------------------------------------------------------------------------
@@ -50,9 +61,10 @@ class OrbitManager(EarthdataAuth):
         Returns:
             dict: A dictionary containing module status, orbit directory, and file count.
         """
-        # Count existing .EOF files
+        # Count existing .EOF files (streaming scandir, no Path objects)
         if self.orbit_dir.exists():
-            eof_count = len(list(self.orbit_dir.glob("*.EOF")))
+            with os.scandir(self.orbit_dir) as it:
+                eof_count = sum(1 for e in it if e.name.endswith(".EOF") and e.is_file(follow_symlinks=False))
         else:
             eof_count = 0
         
@@ -68,28 +80,33 @@ class OrbitManager(EarthdataAuth):
     # --------------------------------------------------------------------------
     # 1. Helper Methods
     # --------------------------------------------------------------------------
+    def _parse_filename(self, filename):
+        """
+        Extracts the Mission ID and acquisition start timestamp from a Sentinel-1 filename.
+
+        A single precompiled regex match; passing only the timestamp (not the full filename)
+        to the 'sentineleof' library is what keeps Sentinel-1C supported.
+
+        Args:
+            filename (str): The Sentinel-1 SLC filename (e.g., 'S1A_IW_SLC__1SDV_20220101T060000_...').
+
+        Returns:
+            tuple: (mission, timestamp), e.g. ('S1A', '20220101T060000'), or (None, None) if parsing fails.
+        """
+        m = self._FN_RE.match(filename)
+        return (m.group(1), m.group(2)) if m else (None, None)
+
     def _get_timestamp_from_filename(self, filename):
         """
         Extracts the acquisition start timestamp (YYYYMMDDTHHMMSS) from a Sentinel-1 filename.
 
-        This method is crucial for supporting Sentinel-1C, as passing the full filename
-        to the 'sentineleof' library can cause parsing errors.
-
         Args:
             filename (str): The Sentinel-1 SLC filename (e.g., 'S1A_IW_SLC__1SDV_20220101T060000_...').
 
         Returns:
             str or None: The extracted timestamp string (e.g., '20220101T060000') or None if parsing fails.
         """
-        try:
-            parts = filename.split('_')
-            # In the standard naming convention, the start timestamp is at index 5.
-            timestamp = parts[5]
-            if len(timestamp) == 15 and 'T' in timestamp:
-                return timestamp
-            return None
-        except IndexError:
-            return None
+        return self._parse_filename(filename)[1]
 
     def _get_mission_from_filename(self, filename):
         """
@@ -101,18 +118,122 @@ class OrbitManager(EarthdataAuth):
         Returns:
             str or None: 'S1A', 'S1B', or 'S1C' if found; otherwise, None.
         """
+        return self._parse_filename(filename)[0]
+
+    @staticmethod
+    def _determine_orbit_type(orbit_path):
+        """Determines if an orbit file is Precise (POE) or Restituted (RES)."""
+        filename = str(orbit_path)
+        if "POEORB" in filename:
+            return "Precise (POE)", "✅ Success"
+        elif "RESORB" in filename:
+            return "Restituted (RES)", "✅ Success (RES Found)"
+        return "Unknown Type", "✅ Success"
+
+    @classmethod
+    def _parse_eof_window(cls, eof_name):
+        """
+        Extracts (mission, valid_start, valid_stop) from an EOF filename.
+
+        e.g. 'S1A_OPER_AUX_POEORB_OPOD_20210121T121212_V20201231T225942_20210102T005942.EOF'
+        -> ('S1A', '20201231T225942', '20210102T005942'). Returns None if not an EOF name.
+        """
+        m = cls._EOF_RE.match(Path(eof_name).name)
+        return (m.group(1), m.group(3), m.group(4)) if m else None
+
+    def _scan_orbit_dir(self):
+        """
+        Lists the orbit files already on disk in one scandir pass.
+
+        Returns:
+            list: (mission, 'POE'|'RES', valid_start, valid_stop, path) tuples, POE first.
+        """
+        found = []
+        with os.scandir(self.orbit_dir) as it:
+            for e in it:
+                m = self._EOF_RE.match(e.name)
+                if m: found.append((m.group(1), m.group(2), m.group(3), m.group(4), e.path))
+        found.sort(key=lambda w: w[1] != 'POE')
+        return found
+
+    @staticmethod
+    def _find_on_disk(on_disk, mission, timestamp, precise_only=False):
+        """Returns (kind, path) of an on-disk EOF whose validity window covers the timestamp, or None."""
+        for m, kind, start, stop, path in on_disk:
+            if m == mission and start <= timestamp <= stop and (kind == 'POE' or not precise_only):
+                return kind, path
+        return None
+
+    def _cached_orbit(self, mission, timestamp):
+        """
+        Returns a previously resolved orbit file whose validity window covers the scene, or None.
+
+        POE entries are keyed by day, so a same-day file may still miss a scene near midnight;
+        the window is checked from the filename before the entry is reused.
+        """
+        for key in ((mission, timestamp[:8]), (mission, timestamp)):
+            orbit_path = self._orbit_cache.get(key)
+            window = self._parse_eof_window(orbit_path) if orbit_path else None
+            if window and window[1] <= timestamp <= window[2]:
+                return orbit_path
+        return None
+
+    def _download_batch(self, scenes, orbit_type, max_workers=8):
+        """
+        Requests orbits for many scenes with a single 'download_eofs' call.
+
+        The returned files are matched back to scenes through the validity window in
+        their names. If the batch request fails, the scenes are retried individually
+        (in a thread pool) so a single bad timestamp does not fail the whole stack.
+
+        Args:
+            scenes (list): (scene_name, timestamp, mission) tuples.
+            orbit_type (str): 'precise' or 'restituted'.
+            max_workers (int): Concurrent per-scene requests in the fallback path. Defaults to 8.
+
+        Returns:
+            tuple: ({scene_name: orbit_path}, {scene_name: error message}).
+        """
+        if not scenes: return {}, {}
+
+        def request(batch):
+            return download_eofs(
+                orbit_dts=[ts for _, ts, _ in batch],
+                missions=[m for _, _, m in batch],
+                save_dir=str(self.orbit_dir),
+                orbit_type=orbit_type
+            ) or []
+
+        def request_one(scene):
+            try:
+                return request([scene]), None
+            except Exception as e:
+                return [], str(e)
+
+        errors = {}
         try:
-            mission = filename.split('_')[0]
-            if mission in ["S1A", "S1B", "S1C"]:
-                return mission
-            return None
-        except IndexError:
-            return None
+            orbit_files = request(scenes)
+        except Exception:
+            # Per-scene requests are network-bound: run them concurrently (results stay in order)
+            orbit_files = []
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(scenes))) as ex:
+                for scene, (files, err) in zip(scenes, ex.map(request_one, scenes)):
+                    orbit_files += files
+                    if err: errors[scene[0]] = err
+
+        windows = [(f, self._parse_eof_window(f)) for f in orbit_files]
+        matched = {}
+        for scene_name, timestamp, mission in scenes:
+            for orbit_path, win in windows:
+                if win and win[0] == mission and win[1] <= timestamp <= win[2]:
+                    matched[scene_name] = orbit_path
+                    break
+        return matched, errors
 
     # --------------------------------------------------------------------------
     # 2. Main Logic
     # --------------------------------------------------------------------------
-    def fetch_orbits(self, slc_files, precise_only=False):
+    def fetch_orbits(self, slc_files=None, precise_only=False, slc_manager=None):
         """
         Downloads orbit files for a list of Sentinel-1 SLC scenes.
 
@@ -124,15 +245,25 @@ class OrbitManager(EarthdataAuth):
             slc_files (list or str): A list of SLC file paths/names or a single file path string.
             precise_only (bool): If True, enforces "Strict Mode". If a Precise Orbit is not found
                                  and only a Restituted Orbit is downloaded, it is marked as Failed.
+            slc_manager (S1SLCManager, optional): If provided (and 'slc_files' is None),
+                                 the Master/Slave scene names are taken from its pairs.
 
         Returns:
             pd.DataFrame: A report containing the status for each scene.
                 Columns: ['Scene ID', 'Acq Date', 'Orbit Type', 'Status']
         """
+        import pandas as pd # Deferred: only the report needs it
+
         if download_eofs is None:
             print("[Error] 'sentineleof' library not loaded.")
             return pd.DataFrame()
 
+        if slc_files is None:
+            if slc_manager is None:
+                print("[Error] Provide 'slc_files' or 'slc_manager'.")
+                return pd.DataFrame()
+            slc_files = [name for pair in slc_manager.get_pairs() for name in pair]
+
         if isinstance(slc_files, (str, Path)):
             slc_files = [str(slc_files)]
         else:
@@ -146,103 +277,89 @@ class OrbitManager(EarthdataAuth):
         print(f"               Target Dir: {self.orbit_dir}")
         print(f"               Mode: {mode_str}")
 
+        # 1. Parse all scenes first (invalid names are reported, not requested)
+        on_disk = self._scan_orbit_dir() # Listed once per call
+        rows, scenes, cached = {}, [], {}
+        n_on_disk = 0
         for scene_path in unique_files:
             scene_name = Path(scene_path).name
-            timestamp = self._get_timestamp_from_filename(scene_name)
-            mission = self._get_mission_from_filename(scene_name)
+            mission, timestamp = self._parse_filename(scene_name)
             acq_date = timestamp[:8] if timestamp else "Unknown"
-            
-            status = "Unknown"
-            orbit_type = "-"
-            
+            rows[scene_name] = {'Scene ID': scene_name, 'Acq Date': acq_date, 'Orbit Type': '-', 'Status': "Unknown"}
+
             if timestamp is None or mission is None:
-                results.append({
-                    'Scene ID': scene_name, 'Acq Date': acq_date, 
-                    'Orbit Type': '-', 'Status': '❌ Invalid Filename'
-                })
+                rows[scene_name]['Status'] = '❌ Invalid Filename'
                 continue
 
-            # Inner helper: Verify if the downloaded file is POE or RES
-            def determine_orbit_type(downloaded_paths):
-                """Determines if the downloaded file is Precise (POE) or Restituted (RES)."""
-                if not downloaded_paths:
-                    return None, None
-                
-                filename = str(downloaded_paths[0])
-                
-                if "POEORB" in filename:
-                    return "Precise (POE)", "✅ Success"
-                elif "RESORB" in filename:
-                    return "Restituted (RES)", "✅ Success (RES Found)"
-                else:
-                    return "Unknown Type", "✅ Success"
+            # An EOF on disk already covers the acquisition: no request at all
+            hit = self._find_on_disk(on_disk, mission, timestamp, precise_only)
+            if hit:
+                kind, _ = hit
+                label = "Precise (POE)" if kind == 'POE' else "Restituted (RES)"
+                rows[scene_name].update({'Orbit Type': f"{label} [cached]", 'Status': "✅ Cached"})
+                n_on_disk += 1
+                continue
 
-            try:
-                # 1. Strategy A: Attempt to download Precise Orbit (POEORB)
-                orbits = download_eofs(
-                    orbit_dts=[timestamp],
-                    missions=[mission],
-                    save_dir=str(self.orbit_dir),
-                    orbit_type='precise'
-                )
-                
-                if orbits:
-                    orbit_type, status = determine_orbit_type(orbits)
-                    
-                    # [Strict Mode Check]
-                    if precise_only and "Restituted" in orbit_type:
-                        status = "❌ Failed (Strict Mode: Only RES found)"
-                        # Optional: os.remove(orbits[0]) 
-                
-                else:
-                    # 2. Strategy B: Fallback Logic (if POE failed)
-                    if precise_only:
-                        status = "❌ Failed (Precise Missing)"
-                        orbit_type = "None"
-                    else:
-                        print(f"   [Info] POE request returned empty for {acq_date}. Trying RESORB...")
-                        orbits_res = download_eofs(
-                            orbit_dts=[timestamp],
-                            missions=[mission],
-                            save_dir=str(self.orbit_dir),
-                            orbit_type='restituted'
-                        )
-                        
-                        if orbits_res:
-                            orbit_type, status = determine_orbit_type(orbits_res)
-                            status = "⚠️ Fallback" 
-                        else:
-                            status = "❌ Failed (Both Missing)"
-                            orbit_type = "None"
-            
-            except Exception as e:
-                err_msg = str(e)
-                status = f"❌ Error: {err_msg}"
-                
-                # Attempt fallback to RESORB even on error
-                if not precise_only and "restituted" not in err_msg:
-                     try:
-                        orbits_res = download_eofs(
-                            orbit_dts=[timestamp],
-                            missions=[mission],
-                            save_dir=str(self.orbit_dir),
-                            orbit_type='restituted'
-                        )
-                        if orbits_res:
-                            orbit_type, _ = determine_orbit_type(orbits_res)
-                            status = "⚠️ Fallback (After Error)"
-                     except:
-                         pass
-            
-            results.append({
-                'Scene ID': scene_name,
-                'Acq Date': acq_date,
-                'Orbit Type': orbit_type,
-                'Status': status
-            })
+            # Same mission/day already resolved in this session: no request
+            orbit_path = self._cached_orbit(mission, timestamp)
+            if orbit_path:
+                cached[scene_name] = orbit_path
+                continue
+            scenes.append((scene_name, timestamp, mission))
+
+        if n_on_disk or cached:
+            print(f"   [Info] Reusing orbits for {n_on_disk + len(cached)} scenes (already downloaded).")
+
+        # 2. Strategy A: Precise Orbits (POEORB) for all scenes in one request
+        poe, poe_errors = self._download_batch(scenes, 'precise')
+        for scene_name, _, mission in scenes:
+            if scene_name in poe:
+                self._orbit_cache[(mission, rows[scene_name]['Acq Date'])] = str(poe[scene_name])
+
+        for scene_name, orbit_path in {**cached, **poe}.items():
+            orbit_type, status = self._determine_orbit_type(orbit_path)
+            # [Strict Mode Check]
+            if precise_only and "Restituted" in orbit_type:
+                status = "❌ Failed (Strict Mode: Only RES found)"
+            rows[scene_name].update({'Orbit Type': orbit_type, 'Status': status})
+
+        missing = [sc for sc in scenes if sc[0] not in poe]
+        for scene_name, _, _ in missing:
+            if scene_name in poe_errors:
+                rows[scene_name]['Status'] = f"❌ Error: {poe_errors[scene_name]}"
+            elif precise_only:
+                rows[scene_name].update({'Orbit Type': "None", 'Status': "❌ Failed (Precise Missing)"})
 
+        # 3. Strategy B: Fallback to Restituted Orbits (RESORB) for the remaining scenes
+        if missing and not precise_only:
+            print(f"   [Info] POE unavailable for {len(missing)} scenes. Trying RESORB...")
+            res, _ = self._download_batch(missing, 'restituted')
+            for scene_name, timestamp, mission in missing:
+                if scene_name in res:
+                    self._orbit_cache[(mission, timestamp)] = str(res[scene_name])
+                    orbit_type, _ = self._determine_orbit_type(res[scene_name])
+                    status = "⚠️ Fallback (After Error)" if scene_name in poe_errors else "⚠️ Fallback"
+                    rows[scene_name].update({'Orbit Type': orbit_type, 'Status': status})
+                elif scene_name not in poe_errors:
+                    rows[scene_name].update({'Orbit Type': "None", 'Status': "❌ Failed (Both Missing)"})
+
+        results = list(rows.values())
         return pd.DataFrame(results)
 
+    async def fetch_orbits_async(self, slc_files=None, precise_only=False, slc_manager=None):
+        """
+        Asynchronous wrapper around 'fetch_orbits()'.
+
+        Orbit files only depend on scene names, not on SLC pixel data, so this can be
+        gathered alongside 'S1SLCManager.download_selected_async()' to overlap both transfers.
+
+        Returns:
+            pd.DataFrame: Same report as 'fetch_orbits()'.
+        """
+        return await asyncio.to_thread(
+            self.fetch_orbits, slc_files, precise_only=precise_only, slc_manager=slc_manager
+        )
+
     def get_orbit_dir(self):
         """Returns the path to the orbit directory."""
         return self.orbit_dir
\ No newline at end of file